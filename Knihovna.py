@@ -1,9 +1,9 @@
 from .megatherion import *
-import csv
 
 class Knihovna:
     def __init__(self):
         self._data = Knihovna._init_lib()
+        self._data.create_index("Autor")
         self._size = len(self._data)
         
     def add(self, name:str, author:str, genre:str, year:int) -> None:
@@ -13,7 +13,7 @@ class Knihovna:
         del self._data[index]
         
     def bibliography_size(self, author:str) -> int:
-        return len(self._data.filter("Autor", lambda a: a == author))
+        return len(self._data.get_index("Autor")[author])
     
     def export_lib(self, path:Union[Path, str]) -> None:
         """
@@ -21,21 +21,18 @@ class Knihovna:
         Uses 'unix' dialect.
         :param path: path to the 'filename' where the data will be stored 
         """
-        with open(path,"w") as file:
-            
-            w = csv.writer(file, "unix")
-            for row in self._data:
-                w.writerow(row)
+        self._data.to_csv(path, header=False, dialect="unix")
             
     @staticmethod
     def import_lib(path:Union[Path, str]) -> 'Knihovna':
         
-        with open(path,"r") as file:
-            
-            r = csv.reader(file, "unix")
-            ret_lib = Knihovna()            
-            for line in r:
-                ret_lib._data.append_row(line)
+        ret_lib = Knihovna()
+        template = ret_lib._data
+        ret_lib._data = DataFrame.read_csv(path, names=list(template.columns), dialect="unix", na_values=("",),
+                                           dtypes={name: template[name].dtype for name in template.columns},
+                                           categorical=[name for name in template.columns if template[name].categorical])
+        ret_lib._data.create_index("Autor")
+        ret_lib._size = len(ret_lib._data)
                 
         return ret_lib
         ...
@@ -44,7 +41,7 @@ class Knihovna:
     def _init_lib():
         return DataFrame({
             "Nazev": Column([], Type.String),
-            "Autor": Column([], Type.String),
-            "Zanr": Column([], Type.String),
+            "Autor": Column([], Type.String, categorical=True),
+            "Zanr": Column([], Type.String, categorical=True),
             "Rok Vydani": Column([], Type.Float)
             })
\ No newline at end of file
@@ -5,37 +5,38 @@ class WeatherAnalyzer:
     def __init__(self, path:Union[Path,str]) -> None:
         self._data = DataFrame.read_json(path)
            
-    def read_json(self, *path:Union[Path,str]) -> None:
+    def read_json(self, *path:Union[Path,str], workers:int = None) -> None:
         
-        for p in path:
-            self._data = self._data.extend(DataFrame.read_json(p))
+        if not path:
+            return
+        
+        self._data = DataFrame.concat([self._data, DataFrame.read_many(path, workers=workers)])
                
     def monthly_avg(self, month:int, year:int) -> float:
         
-        filtered_df = self._data.filter("rok", lambda r: r == year).filter("mesic", lambda m: m == month)
+        index = self._data.get_index(["rok", "mesic"])
+        if index is None:
+            index = self._data.create_index(["rok", "mesic"])
         
-        temperature_values = []
-        for T in filtered_df.__getitem__(0)[2:]:
-            try:
-                temperature_values.append(float(T))
-            except:
-                continue
+        filtered_df = self._data.take(index[(year, month)][:1])
         
-        return sum(temperature_values)/len(temperature_values)
+        return filtered_df.reduce_rows(list(filtered_df.columns)[2:], "mean")[0]
         
         
-    def monthly_temp_variance(self) -> Column:
+    def monthly_temp_variance(self, executor:ParallelExecutor = None) -> list:
         
-        ret_col = Column([], Type.Float)
+        if executor is None:
+            return _temp_variance(self._data)
         
-        for row in iter(self._data):
-            temperature_values = []
-            for T in row[2:]:
-                try:
-                    temperature_values.append(float(T))
-                except:
-                    continue
-                
-            ret_col.append(round(max(temperature_values) - min(temperature_values), 1))
+        ret_col = []
+        for part in executor.map_partitions(self._data, _temp_variance):
+            ret_col.extend(part)
             
-        return ret_col._data
\ No newline at end of file
+        return ret_col
+
+
+def _temp_variance(df:DataFrame) -> list:
+    # module level function, so it can be sent to processes of ParallelExecutor
+    ret_col = df.reduce_rows(list(df.columns)[2:], "range")
+    
+    return [None if T is None else round(T, 1) for T in ret_col]
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Benchmarks of dataframe operations on synthetic data shaped like `pocasi.json`
+(weather: rok, mesic, X1. ... X31.) and like the library of `Knihovna`
+(Nazev, Autor, Zanr, Rok Vydani).
+
+    python benchmark.py --sizes 1000 10000 100000 --save baseline.json
+    python benchmark.py --sizes 1000 10000 100000 --compare baseline.json
+
+Every operation is timed (the best of `--repeat` runs) and its peak of allocated
+memory is measured by `tracemalloc` in one extra run. The report contains
+throughput (rows per second) and scaling exponent of every operation (slope of
+log(time) against log(rows), 1.0 is linear). In compare mode operations slower
+than baseline by more than `--threshold` are reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from math import log
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from megatherion import Column, DataFrame, Type
+
+OPERATIONS = ("read_json", "read_csv", "filter", "sort", "unique", "sum_by", "extend", "sample",
+              "cummin", "repr")
+DAYS = [f"X{day}." for day in range(1, 32)]
+LIBRARY = {"Nazev": Type.String, "Autor": Type.String, "Zanr": Type.String, "Rok Vydani": Type.Float}
+
+
+def weather_frame(rows: int, rng: random.Random) -> DataFrame:
+    """
+    Synthetic frame with columns of `pocasi.json`, days which months do not have
+    are "NA" (so X29. - X31. are String columns like in the original data).
+    """
+    months = [1 + row % 12 for row in range(rows)]
+    columns = {"rok": Column([1961 + row // 12 for row in range(rows)], Type.Float),
+               "mesic": Column(months, Type.Float)}
+    lengths = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+    for day, name in enumerate(DAYS, 1):
+        values = [round(rng.gauss(8, 8), 1) for _ in range(rows)]
+        if day < 29:
+            columns[name] = Column(values, Type.Float)
+        else:
+            columns[name] = Column([str(value) if day <= lengths[month - 1] else "NA"
+                                    for value, month in zip(values, months)], Type.String)
+    return DataFrame(columns)
+
+
+def library_frame(rows: int, rng: random.Random) -> DataFrame:
+    """
+    Synthetic frame with columns of `Knihovna` (about sqrt(rows) authors, 20 genres).
+    """
+    authors = [f"Autor {number}" for number in range(max(1, int(rows ** 0.5)))]
+    genres = [f"Zanr {number}" for number in range(20)]
+    return DataFrame({
+        "Nazev": Column([f"Kniha {row}" for row in range(rows)], Type.String),
+        "Autor": Column([rng.choice(authors) for _ in range(rows)], Type.String, categorical=True),
+        "Zanr": Column([rng.choice(genres) for _ in range(rows)], Type.String, categorical=True),
+        "Rok Vydani": Column([float(rng.randint(1800, 2023)) for _ in range(rows)], Type.Float)})
+
+
+def write_json(df: DataFrame, path: Path) -> None:
+    with open(path, "w") as file:
+        json.dump({name: list(df[name]) for name in df.columns}, file)
+
+
+def operations(weather: DataFrame, library: DataFrame, directory: Path,
+               seed: int) -> Dict[str, Callable[[], object]]:
+    """
+    :return: benchmarked operations (name -> function without arguments)
+    """
+    json_path, csv_path = directory / "pocasi.json", directory / "knihovna.csv"
+    write_json(weather, json_path)
+    library.to_csv(csv_path, header=False, dialect="unix")
+    year = weather["rok"][len(weather) // 2]
+    return {
+        "read_json": lambda: DataFrame.read_json(json_path),
+        "read_csv": lambda: DataFrame.read_csv(csv_path, names=list(LIBRARY), dtypes=LIBRARY,
+                                               dialect="unix", categorical=["Autor", "Zanr"]),
+        "filter": lambda: weather.filter("rok", lambda value: value == year),
+        "sort": lambda: weather.sort(["X1.", "rok"]),
+        "unique": lambda: library.unique("Autor"),
+        "sum_by": lambda: weather.sum_by("mesic", DAYS[:28]),
+        "extend": lambda: weather.extend(weather),
+        "sample": lambda: weather.sample(max(1, len(weather) // 10), random_state=seed),
+        "cummin": lambda: weather.cummin("X1."),
+        "repr": lambda: repr(weather),
+    }
+
+
+def measure(function: Callable[[], object], repeat: int) -> Tuple[float, int]:
+    """
+    :return: the best time of `repeat` runs (seconds) and peak of allocated memory (bytes)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        function()
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def scaling(points: List[Tuple[int, float]]) -> float:
+    """
+    :param points: pairs (rows, seconds)
+    :return: slope of least squares line of log(seconds) against log(rows) (None for one point)
+    """
+    points = [(log(rows), log(seconds)) for rows, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+
+
+def run(sizes: List[int], names: List[str], repeat: int, seed: int) -> Dict[str, Dict[str, Dict]]:
+    """
+    :return: results (operation -> rows -> measured values)
+    """
+    results = {name: {} for name in names}
+    for rows in sizes:
+        rng = random.Random(seed)
+        weather, library = weather_frame(rows, rng), library_frame(rows, rng)
+        with tempfile.TemporaryDirectory() as directory:
+            functions = operations(weather, library, Path(directory), seed)
+            for name in names:
+                seconds, peak = measure(functions[name], repeat)
+                results[name][str(rows)] = {"seconds": seconds, "rows_per_second": rows / seconds,
+                                            "peak_bytes": peak}
+                print(f"{name:10s} {rows:>10d} rows {seconds:10.4f} s", file=sys.stderr)
+    return results
+
+
+def report(results: Dict[str, Dict[str, Dict]]) -> str:
+    lines = [f"{'operation':10s} {'rows':>10s} {'seconds':>10s} {'rows/s':>12s} {'peak MiB':>10s}"]
+    for name, by_rows in results.items():
+        for rows, values in by_rows.items():
+            lines.append(f"{name:10s} {rows:>10s} {values['seconds']:10.4f} "
+                         f"{values['rows_per_second']:12.0f} {values['peak_bytes'] / 2 ** 20:10.2f}")
+    lines.append("")
+    lines.append("scaling (time ~ rows ^ exponent)")
+    for name, by_rows in results.items():
+        exponent = scaling([(int(rows), values["seconds"]) for rows, values in by_rows.items()])
+        lines.append(f"{name:10s} {'n/a' if exponent is None else format(exponent, '.2f'):>10s}")
+    return "\n".join(lines)
+
+
+def compare(results: Dict[str, Dict[str, Dict]], baseline: Dict[str, Dict[str, Dict]],
+            threshold: float) -> Tuple[str, List[str]]:
+    """
+    :return: report of comparison and list of regressions
+    """
+    lines = [f"{'operation':10s} {'rows':>10s} {'baseline s':>12s} {'current s':>12s} {'ratio':>8s}"]
+    regressions = []
+    for name, by_rows in results.items():
+        for rows, values in by_rows.items():
+            if rows not in baseline.get(name, {}):
+                continue
+            before = baseline[name][rows]["seconds"]
+            ratio = values["seconds"] / before
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} ({rows} rows)")
+            lines.append(f"{name:10s} {rows:>10s} {before:12.4f} {values['seconds']:12.4f} "
+                         f"{ratio:8.2f}{flag}")
+    return "\n".join(lines), regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks of megatherion dataframes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="numbers of rows of synthetic frames (up to 10^7)")
+    parser.add_argument("--ops", nargs="+", help="benchmarked operations (all by default)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs of every operation")
+    parser.add_argument("--seed", type=int, default=0, help="seed of synthetic data")
+    parser.add_argument("--save", type=Path, help="store results as JSON baseline")
+    parser.add_argument("--compare", type=Path, help="compare results with JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown against baseline (0.2 is 20 %%)")
+    args = parser.parse_args()
+
+    names = args.ops or list(OPERATIONS)
+    for name in names:
+        if name not in OPERATIONS:
+            parser.error(f"unknown operation {name} (available: {', '.join(OPERATIONS)})")
+
+    results = run(sorted(args.sizes), names, args.repeat, args.seed)
+    print(report(results))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                       "cpus": os.cpu_count(), "results": results}, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        text, regressions = compare(results, baseline, args.threshold)
+        print()
+        print(text)
+        if regressions:
+            print("\nregressions: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
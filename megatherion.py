@@ -1,11 +1,36 @@
 from abc import abstractmethod, ABC
-from json import load
+from array import array
+from bisect import bisect, bisect_left, bisect_right, insort
+from json import dumps, load, loads, JSONDecodeError, JSONDecoder
 from numbers import Real
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, Tuple, Union, Any, List, Callable
+from typing import Dict, Iterable, Iterator, Tuple, Union, Any, List, Callable, TextIO
 from enum import Enum
+from collections import Counter, deque
 from collections.abc import MutableSequence
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from contextlib import contextmanager
+from functools import partial, wraps
+from hashlib import blake2b
+from heapq import nlargest
+from math import exp, floor, inf, log, sqrt
+from itertools import accumulate, chain, compress, islice, repeat
+import codecs
+import csv
+import io
+import logging
+import mmap
+import os
+import operator
 import random
+import re
+import tempfile
+from sys import byteorder, getsizeof
+from time import perf_counter
+
+
+logger = logging.getLogger(__name__)
 
 
 class Type(Enum):
@@ -27,6 +52,16 @@ def to_str(obj) -> str:
     return str(obj) if obj is not None else None
 
 
+def _parse_float(obj) -> Union[float, None]:
+    """
+    casts object to float, objects which are not numbers (eg. None or "NA") are cast to None
+    """
+    try:
+        return float(obj)
+    except (TypeError, ValueError):
+        return None
+
+
 def common(iterable): # from ChatGPT
     """
     returns True if all items of iterable are the same.
@@ -50,17 +85,307 @@ def common(iterable): # from ChatGPT
     return first_value
 
 
+class Tracer:
+    """
+    Records of dataframe operations traced by `trace`: wall time, counts of input
+    and output rows, number of columns copied before modification (copy-on-write,
+    see `Column._writable`) and bytes of newly allocated columns of result.
+    Operations called by traced operation are not recorded separately.
+    """
+    def __init__(self):
+        self.records = []
+        self._copies = 0
+        self._active = False
+
+    def _call(self, function: Callable, args: Tuple, kwargs: Dict) -> Any:
+        if self._active:
+            return function(*args, **kwargs)
+        frames = list(Tracer._frames(args))
+        inputs = {id(column._data) for frame in frames for column in frame._columns.values()}
+        rows_in = sum(len(frame) for frame in frames) if frames else None
+        self._active = True
+        copies = self._copies
+        start = perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            seconds = perf_counter() - start
+            self._active = False
+        if result is None and frames:
+            # operation modifies dataframe in place
+            result = frames[0]
+        columns = (result._columns.values() if isinstance(result, DataFrame)
+                   else [result] if isinstance(result, Column) else [])
+        self.records.append({
+            "operation": function.__qualname__,
+            "seconds": seconds,
+            "rows_in": rows_in,
+            "rows_out": len(result) if isinstance(result, (DataFrame, Column)) else None,
+            "columns_copied": self._copies - copies,
+            "bytes": sum(column.nbytes for column in columns if id(column._data) not in inputs)})
+        return result
+
+    @staticmethod
+    def _frames(args: Tuple) -> Iterator['DataFrame']:
+        """
+        Input dataframes of operation (also in lists of arguments and sources of lazy frames).
+        """
+        for arg in args:
+            if isinstance(arg, (list, tuple)) and arg and isinstance(arg[0], (DataFrame, LazyFrame)):
+                yield from Tracer._frames(arg)
+            elif isinstance(arg, DataFrame):
+                yield arg
+            elif isinstance(arg, (LazyFrame, GroupBy)):
+                yield arg._source if isinstance(arg, LazyFrame) else arg._df
+
+    def summary(self) -> 'DataFrame':
+        """
+        Totals of records for every operation (the slowest operations first).
+        :return: dataframe with columns operation, calls, seconds, rows_in,
+                 rows_out, columns_copied and bytes
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record["operation"], [0, 0.0, 0, 0, 0, 0])
+            for position, value in enumerate((1, record["seconds"], record["rows_in"] or 0,
+                                              record["rows_out"] or 0, record["columns_copied"],
+                                              record["bytes"])):
+                total[position] += value
+        ordered = sorted(totals.items(), key=lambda item: -item[1][1])
+        names = ["calls", "seconds", "rows_in", "rows_out", "columns_copied", "bytes"]
+        columns = {"operation": Column([operation for operation, _ in ordered], Type.String)}
+        for position, name in enumerate(names):
+            columns[name] = Column([total[position] for _, total in ordered], Type.Float)
+        return DataFrame._from_columns(columns)
+
+    def to_json(self, path: Union[Path, str, None] = None) -> str:
+        """
+        Exports records as JSON (list of objects).
+        :param path: optional path of written file
+        :return: JSON document
+        """
+        document = dumps(self.records, indent=2)
+        if path is not None:
+            Path(path).write_text(document)
+        return document
+
+
+_tracer = None
+
+
+@contextmanager
+def trace() -> Iterator[Tracer]:
+    """
+    Traces dataframe operations in block, eg.
+    `with trace() as tracer: ...` and then `print(tracer.summary())`.
+    :return: tracer with records
+    """
+    global _tracer
+    previous, _tracer = _tracer, Tracer()
+    try:
+        yield _tracer
+    finally:
+        _tracer = previous
+
+
+def _traced(function: Callable) -> Callable:
+    """
+    Decorator of traced operations (only global tracer is checked when tracing is off).
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if _tracer is None:
+            return function(*args, **kwargs)
+        return _tracer._call(function, args, kwargs)
+    return wrapper
+
+
+class Mask:
+    """
+    Boolean mask over rows of dataframe (eg. result of comparison `df["rok"] == 1961`).
+    Masks can be combined by operators `&`, `|`, `^` and `~` and are used by
+    `DataFrame.filter`. Mask is stored as bytearray with one byte (0 or 1) per row.
+    """
+    def __init__(self, values: Iterable):
+        self._data = values if isinstance(values, bytearray) else bytearray(map(bool, values))
+
+    @staticmethod
+    def _from_int(bits: int, size: int) -> 'Mask':
+        return Mask(bytearray(bits.to_bytes(size, "little")))
+
+    def _int(self) -> int:
+        # whole mask as one big integer (fast elementwise logical operations)
+        return int.from_bytes(self._data, "little")
+
+    def _check(self, other: 'Mask') -> None:
+        if not isinstance(other, Mask):
+            raise TypeError("Mask can be combined only with another mask")
+        assert len(other) == len(self), "Masks have different lengths"
+
+    def __and__(self, other: 'Mask') -> 'Mask':
+        self._check(other)
+        return Mask._from_int(self._int() & other._int(), len(self))
+
+    def __or__(self, other: 'Mask') -> 'Mask':
+        self._check(other)
+        return Mask._from_int(self._int() | other._int(), len(self))
+
+    def __xor__(self, other: 'Mask') -> 'Mask':
+        self._check(other)
+        return Mask._from_int(self._int() ^ other._int(), len(self))
+
+    def __invert__(self) -> 'Mask':
+        return Mask._from_int(self._int() ^ int.from_bytes(b"\x01" * len(self), "little"),
+                              len(self))
+
+    def __bool__(self):
+        raise ValueError("The truth value of a mask is ambiguous (use & and | instead of and, or)")
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, index: int) -> bool:
+        return bool(self._data[index])
+
+    def __iter__(self) -> Iterator[bool]:
+        return map(bool, self._data)
+
+    def __repr__(self) -> str:
+        return f"Mask({list(self)})"
+
+    def count(self) -> int:
+        """
+        :return: number of selected rows (True values)
+        """
+        return self._data.count(1)
+
+    def indices(self) -> List[int]:
+        """
+        :return: positions of selected rows
+        """
+        return list(compress(range(len(self._data)), self._data))
+
+
 class Column(MutableSequence):# implement MutableSequence (some method are mixed from abc)
     """
     Representation of column of dataframe. Column has datatype: float columns contains
     only floats and None values, string columns contains strings and None values.
+
+    Float columns are stored in a contiguous `array('d')` buffer, None values are
+    tracked by a separate validity mask (one byte per row, 0 means None). The buffer
+    can be shared with other tools without copying (see `buffer`).
+
+    String columns can be dictionary-encoded (`categorical=True`): every distinct
+    string is stored once in a table of categories and rows hold only integer codes
+    into this table (code -1 means None).
+
+    Copies of columns share buffers until they are modified (copy-on-write), so
+    dataframes can share columns without copying data.
     """
-    def __init__(self, data: Iterable, dtype: Type):
+    def __init__(self, data: Iterable, dtype: Type, *, categorical: bool = False):
         self.dtype = dtype
         self._cast = to_float if self.dtype == Type.Float else to_str
         # cast function (it casts to floats for Float datatype or
         # to strings for String datattype)
-        self._data = [self._cast(value) for value in data]
+        assert not categorical or dtype == Type.String, "Only String columns can be categorical"
+        self._valid = None
+        self._categories = None
+        self._shared = False # buffers are shared with a copy of column
+        values = [self._cast(value) for value in data]
+        if self.dtype == Type.Float:
+            self._valid = bytearray(value is not None for value in values)
+            self._data = array("d", [0.0 if value is None else value for value in values])
+        elif categorical:
+            self._categories = []
+            self._lookup = {}
+            self._data = array("i", [self._code(value) for value in values])
+        else:
+            self._data = values
+
+    @staticmethod
+    def _from_buffers(dtype: Type, data: Union[array, list],
+                      valid: Union[bytearray, None] = None,
+                      categories: Union[List[str], None] = None) -> 'Column':
+        """
+        Creates column directly from internal buffers (values are not cast again).
+        :param dtype: type of column
+        :param data: `array('d')` for Float columns, list for String columns or
+                     `array('i')` of codes for categorical columns
+        :param valid: validity mask of Float column
+        :param categories: table of categories of categorical column
+        :return: new column which owns the buffers
+        """
+        column = Column([], dtype, categorical=categories is not None)
+        column._data = data
+        if dtype == Type.Float:
+            column._valid = valid if valid is not None else bytearray(b"\x01") * len(data)
+        if categories is not None:
+            column._categories = categories
+            column._lookup = {value: code for code, value in enumerate(categories)}
+        return column
+
+    @property
+    def categorical(self) -> bool:
+        """
+        :return: True for dictionary-encoded String column
+        """
+        return self._categories is not None
+
+    @property
+    def categories(self) -> List[str]:
+        """
+        :return: table of distinct values of categorical column (indexed by codes)
+        """
+        assert self.categorical, "Column is not categorical"
+        return list(self._categories)
+
+    def _code(self, value: Union[str, None]) -> int:
+        """
+        Returns code of (already cast) value in categorical column, unknown values
+        are added to the table of categories.
+        """
+        if value is None:
+            return -1
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self._categories)
+            self._categories.append(value)
+        return code
+
+    def encode(self) -> 'Column':
+        """
+        Returns dictionary-encoded (categorical) copy of String column.
+        :return: new categorical column
+        """
+        assert self.dtype == Type.String, "Only String columns can be categorical"
+        if self.categorical:
+            return self.copy()
+        return Column(self._data, self.dtype, categorical=True)
+
+    def decode(self) -> 'Column':
+        """
+        Returns plain (not dictionary-encoded) copy of column.
+        :return: new column
+        """
+        if not self.categorical:
+            return self.copy()
+        return Column._from_buffers(self.dtype, list(self))
+
+    def _pack(self, values: Iterable, cast: bool = True) -> Tuple[Union[array, list], Union[bytearray, None]]:
+        """
+        Casts values and converts them to internal representation of column.
+        :param values: iterable of values
+        :param cast: values are cast (False for list of already cast values)
+        :return: pair (data buffer, validity mask or None for String columns)
+        """
+        if cast:
+            values = [self._cast(value) for value in values]
+        if self._categories is not None:
+            return array("i", [self._code(value) for value in values]), None
+        if self._valid is None:
+            return values, None
+        return (array("d", [0.0 if value is None else value for value in values]),
+                bytearray(value is not None for value in values))
 
     def __len__(self) -> int:
         """
@@ -77,7 +402,29 @@ class Column(MutableSequence):# implement MutableSequence (some method are mixed
         :param item: index or slice
         :return: item or list of items
         """
-        return self._data[item]
+        if self._categories is not None:
+            if isinstance(item, slice):
+                categories = self._categories + [None] # code -1 selects None
+                return [categories[code] for code in self._data[item]]
+            code = self._data[item]
+            return None if code < 0 else self._categories[code]
+        if self._valid is None:
+            return self._data[item]
+        if isinstance(item, slice):
+            return [value if valid else None
+                    for value, valid in zip(self._data[item], self._valid[item])]
+        return self._data[item] if self._valid[item] else None
+
+    def __iter__(self) -> Iterator[Union[float, str]]:
+        """
+        :return: iterator over items of column
+        """
+        if self._categories is not None:
+            categories = self._categories + [None]
+            return (categories[code] for code in self._data)
+        if self._valid is None:
+            return iter(self._data)
+        return (value if valid else None for value, valid in zip(self._data, self._valid))
 
     def __setitem__(self, key: Union[int, slice], value: Any) -> None:
         """
@@ -87,7 +434,13 @@ class Column(MutableSequence):# implement MutableSequence (some method are mixed
         :param value: simple value or list of values
 
         """
-        self._data[key] = self._cast(value)
+        self._writable()
+        data, valid = self._pack(value if isinstance(key, slice) else [value])
+        if not isinstance(key, slice):
+            data, valid = data[0], (valid[0] if valid is not None else None)
+        self._data[key] = data
+        if valid is not None:
+            self._valid[key] = valid
 
     def append(self, item: Any) -> None:
         """
@@ -95,7 +448,15 @@ class Column(MutableSequence):# implement MutableSequence (some method are mixed
         Implementation of abstract base class `MutableSequence`.
         :param item: appended value
         """
-        self._data.append(self._cast(item))
+        self._writable()
+        item = self._cast(item)
+        if self._categories is not None:
+            self._data.append(self._code(item))
+        elif self._valid is None:
+            self._data.append(item)
+        else:
+            self._data.append(0.0 if item is None else item)
+            self._valid.append(item is not None)
 
     def insert(self, index: int, value: Any) -> None:
         """
@@ -105,33 +466,441 @@ class Column(MutableSequence):# implement MutableSequence (some method are mixed
         :param value:  inserted value
         :return:
         """
-        self._data.insert(index, self._cast(value))
+        self._writable()
+        value = self._cast(value)
+        if self._categories is not None:
+            self._data.insert(index, self._code(value))
+        elif self._valid is None:
+            self._data.insert(index, value)
+        else:
+            self._data.insert(index, 0.0 if value is None else value)
+            self._valid.insert(index, value is not None)
 
     def __delitem__(self, index: Union[int, slice]) -> None:
         """
         Remove item from index `index` or sublist defined by `slice`.
         :param index: index or slice
         """
+        self._writable()
         del self._data[index]
+        if self._valid is not None:
+            del self._valid[index]
+
+    def extend(self, values: Iterable) -> None:
+        """
+        Appends all values at once (values are cast only once and the buffer grows in bulk).
+        :param values: appended values
+        """
+        self._writable()
+        data, valid = self._pack(values)
+        self._data.extend(data)
+        if valid is not None:
+            self._valid.extend(valid)
+
+    @staticmethod
+    def _concat(columns: List['Column']) -> 'Column':
+        """
+        Concatenates columns of the same type into new column (buffers of result
+        are allocated once). Categorical columns are concatenated to categorical
+        column (codes are remapped to union of categories).
+        """
+        dtype = common(column.dtype for column in columns)
+        total = sum(len(column) for column in columns)
+        if dtype == Type.Float:
+            data, valid = array("d", bytes(8 * total)), bytearray(total)
+            with memoryview(data) as data_view, memoryview(valid) as valid_view:
+                position = 0
+                for column in columns:
+                    data_view[position:position + len(column)] = memoryview(column._data)
+                    valid_view[position:position + len(column)] = memoryview(column._valid)
+                    position += len(column)
+            return Column._from_buffers(dtype, data, valid)
+
+        if all(column.categorical for column in columns):
+            result = Column._from_buffers(dtype, array("i", bytes(4 * total)),
+                                          categories=columns[0]._categories[:])
+            with memoryview(result._data) as view:
+                position = 0
+                for column in columns:
+                    codes = column._data
+                    if column._categories != result._categories[:len(column._categories)]:
+                        remap = [result._code(value) for value in column._categories] + [-1]
+                        codes = array("i", map(remap.__getitem__, codes))
+                    view[position:position + len(column)] = memoryview(codes)
+                    position += len(column)
+            return result
+
+        return Column._from_buffers(dtype, list(chain.from_iterable(
+            column if column.categorical else column._data for column in columns)))
+
+    def _writable(self) -> None:
+        """
+        Column gets its own buffers before the first modification: buffers shared
+        with copies of column (see `copy`) and read-only buffers mapped from file
+        (see `DataFrame.read_binary`) are copied.
+        """
+        if _tracer is not None and (self._shared or isinstance(self._data, memoryview)):
+            _tracer._copies += 1
+        if isinstance(self._data, memoryview):
+            data = array(self._data.format)
+            data.frombytes(self._data.cast("B"))
+            self._data = data
+        elif self._shared:
+            self._data = self._data[:]
+        if self._valid is not None and (self._shared or isinstance(self._valid, memoryview)):
+            self._valid = bytearray(self._valid)
+        if self._shared and self._categories is not None:
+            self._categories = self._categories[:]
+            self._lookup = dict(self._lookup)
+        self._shared = False
+
+    def buffer(self) -> memoryview:
+        """
+        Returns zero-copy view of the float64 buffer of Float column (items which
+        are None in column have undefined value in buffer, see `validity`).
+        :return: memoryview with format 'd'
+        """
+        if self.dtype != Type.Float:
+            raise TypeError("Only Float columns are backed by a buffer")
+        return memoryview(self._data)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """
+        Buffer protocol (Python 3.12+), `memoryview(column)` is the same as `column.buffer()`.
+        """
+        return self.buffer()
+
+    def validity(self) -> memoryview:
+        """
+        Returns zero-copy view of validity mask of Float column (0 for None items, 1 otherwise).
+        :return: memoryview with format 'B'
+        """
+        if self.dtype != Type.Float:
+            raise TypeError("Only Float columns have validity mask")
+        return memoryview(self._valid)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: (approximate) number of bytes occupied by values of column
+        """
+        if self._valid is not None:
+            return len(self._data) * self._data.itemsize + len(self._valid)
+        if self._categories is not None:
+            return (len(self._data) * self._data.itemsize + getsizeof(self._lookup)
+                    + getsizeof(self._categories)
+                    + sum(getsizeof(value) for value in self._categories))
+        return getsizeof(self._data) + sum(getsizeof(value) for value in set(self._data))
 
     def permute(self, indices: List[int]) -> 'Column':
         """
         Return new column which items are defined by list of indices (to original column).
         (eg. `Column(["a", "b", "c"]).permute([0,0,2])`
         returns  `Column(["a", "a", "c"])
+        Indices can repeat or omit items, so the result can have any length,
+        index None produces None item.
         :param indices: list of indexes (ints between 0 and len(self) - 1)
         :return: new column
         """
-        assert len(indices) == len(self)
-        ...
+        try:
+            return self._gather(indices)
+        except TypeError:
+            # some indices are None (eg. missing rows of outer joins)
+            return self._gather_optional(indices)
+
+    def _gather(self, indices: Iterable[int]) -> 'Column':
+        data = self._data
+        if self._valid is not None:
+            return Column._from_buffers(self.dtype, array("d", map(data.__getitem__, indices)),
+                                        bytearray(map(self._valid.__getitem__, indices)))
+        if self._categories is not None:
+            return Column._from_buffers(self.dtype, array("i", map(data.__getitem__, indices)),
+                                        categories=self._categories[:])
+        return Column._from_buffers(self.dtype, list(map(data.__getitem__, indices)))
+
+    def _gather_optional(self, indices: Iterable[Union[int, None]]) -> 'Column':
+        # index None produces None item
+        data = self._data
+        if self._valid is not None:
+            return Column._from_buffers(
+                self.dtype,
+                array("d", [0.0 if index is None else data[index] for index in indices]),
+                bytearray(0 if index is None else self._valid[index] for index in indices))
+        if self._categories is not None:
+            return Column._from_buffers(
+                self.dtype, array("i", [-1 if index is None else data[index] for index in indices]),
+                categories=self._categories[:])
+        return Column._from_buffers(self.dtype,
+                                    [None if index is None else data[index] for index in indices])
+
+    def compress(self, mask: 'Mask') -> 'Column':
+        """
+        Return new column with items selected by boolean mask.
+        :param mask: mask with the same length as column
+        :return: new column
+        """
+        assert len(mask) == len(self), "Mask has different length than column"
+        selectors = mask._data
+        if self._valid is not None:
+            return Column._from_buffers(self.dtype, array("d", compress(self._data, selectors)),
+                                        bytearray(compress(self._valid, selectors)))
+        if self._categories is not None:
+            return Column._from_buffers(self.dtype, array("i", compress(self._data, selectors)),
+                                        categories=self._categories[:])
+        return Column._from_buffers(self.dtype, list(compress(self._data, selectors)))
+
+    def _floats(self) -> Tuple[Union[array, memoryview], Union[bytearray, memoryview]]:
+        """
+        Items of column as floats and validity mask (items of String columns which
+        are not numbers, eg. "NA", are not valid). Categories are parsed only once.
+        """
+        if self._valid is not None:
+            return self._data, self._valid
+        if self._categories is not None:
+            table = [_parse_float(value) for value in self._categories] + [None]
+            parsed = list(map(table.__getitem__, self._data))
+        else:
+            parsed = list(map(_parse_float, self._data))
+        return (array("d", [0.0 if value is None else value for value in parsed]),
+                bytearray(value is not None for value in parsed))
+
+    def isnull(self) -> 'Mask':
+        """
+        :return: mask of None items
+        """
+        if self._valid is not None:
+            return ~Mask(bytearray(self._valid))
+        if self._categories is not None:
+            return Mask(map(operator.eq, self._data, repeat(-1)))
+        return Mask(map(operator.is_, self._data, repeat(None)))
+
+    def notnull(self) -> 'Mask':
+        """
+        :return: mask of items which are not None
+        """
+        return ~self.isnull()
+
+    def _compare(self, op: Callable[[Any, Any], bool], other: Any) -> 'Mask':
+        """
+        Elementwise comparison of column with scalar value or other column.
+        None items never satisfy the comparison.
+        :param op: comparison operator (from module `operator`)
+        :param other: scalar value or column with the same length
+        :return: boolean mask
+        """
+        if isinstance(other, Column):
+            assert len(other) == len(self), "Columns have different lengths"
+            return Mask(a is not None and b is not None and op(a, b) for a, b in zip(self, other))
+        if other is None:
+            raise ValueError("Comparison with None is not supported (use isnull/notnull)")
+        if self._valid is not None:
+            return Mask(bytearray(map(op, self._data, repeat(other)))) & Mask(bytearray(self._valid))
+        if self._categories is not None:
+            if op is operator.eq:
+                # one integer comparison per row
+                return Mask(map(operator.eq, self._data, repeat(self._lookup.get(other, -2))))
+            return Mask(self._matches(lambda value: value is not None and op(value, other)))
+        return Mask(value is not None and op(value, other) for value in self._data)
+
+    def __eq__(self, other: Any) -> 'Mask':
+        return self._compare(operator.eq, other)
+
+    def __ne__(self, other: Any) -> 'Mask':
+        return self._compare(operator.ne, other)
+
+    def __lt__(self, other: Any) -> 'Mask':
+        return self._compare(operator.lt, other)
+
+    def __le__(self, other: Any) -> 'Mask':
+        return self._compare(operator.le, other)
+
+    def __gt__(self, other: Any) -> 'Mask':
+        return self._compare(operator.gt, other)
+
+    def __ge__(self, other: Any) -> 'Mask':
+        return self._compare(operator.ge, other)
+
+    __hash__ = None
 
     def copy(self) -> 'Column':
         """
-        Return shallow copy of column.
+        Return shallow copy of column. Copy is created in constant time, both columns
+        share buffers until one of them is modified (copy-on-write).
         :return: new column with the same items
         """
-        # FIXME: value is cast to the same type (minor optimisation problem)
-        return Column(self._data, self.dtype)
+        column = Column.__new__(Column)
+        column.__dict__.update(self.__dict__)
+        self._shared = column._shared = True
+        return column
+
+    def _matches(self, predicate: Callable[[Union[float, str]], bool]) -> Iterable[bool]:
+        """
+        Evaluates predicate for all items of column. For categorical columns the
+        predicate is evaluated only once per category and rows compare codes.
+        :param predicate: testing function
+        :return: iterable of results (one for each row)
+        """
+        if self._categories is None:
+            return map(predicate, self)
+        accepted = [bool(predicate(value)) for value in self._categories]
+        accepted.append(-1 in self._data and bool(predicate(None)))
+        return (accepted[code] for code in self._data)
+
+    def argsort(self, ascending: bool = True, na_position: str = "last",
+                indices: Iterable[int] = None) -> List[int]:
+        """
+        Returns indices of items in sorted order (sorting is stable, only the key
+        column is sorted).
+        :param ascending: direction of sorting
+        :param na_position: position of None items ("first" or "last")
+        :param indices: sorted subset of indices (all indices by default)
+        :return: list of indices
+        """
+        if na_position not in ("first", "last"):
+            raise ValueError("na_position has to be 'first' or 'last'")
+        if self._valid is not None:
+            keys, present = self._data, self._valid
+        elif self._categories is not None:
+            keys = self._sort_keys()
+            present = bytearray(map(operator.ne, self._data, repeat(-1)))
+        else:
+            keys = self._data
+            present = bytearray(map(operator.is_not, keys, repeat(None)))
+
+        if indices is None:
+            selected = list(compress(range(len(self)), present))
+            missing = list(compress(range(len(self)), map(operator.not_, present)))
+        else:
+            selected = [index for index in indices if present[index]]
+            missing = [index for index in indices if not present[index]]
+        selected.sort(key=keys.__getitem__, reverse=not ascending)
+        return missing + selected if na_position == "first" else selected + missing
+
+    _CUMULATIVE = {"min": (min, inf), "max": (max, -inf),
+                   "sum": (operator.add, 0.0), "prod": (operator.mul, 1.0)}
+
+    def cumulative(self, op: str, skipna: bool = True) -> 'Column':
+        """
+        Cumulative minimum, maximum, sum or product of float column. If `skipna` is
+        True, None items get the result for preceding values (items before the first
+        value are None), otherwise the result is None since the first None item.
+        :param op: "min", "max", "sum" or "prod"
+        :param skipna: None items are skipped
+        :return: new column
+        """
+        assert self.dtype == Type.Float, "Cumulative functions are defined only for float columns"
+        if op not in Column._CUMULATIVE:
+            raise ValueError("Unsupported cumulative function " + op)
+        function, identity = Column._CUMULATIVE[op]
+        size = len(self)
+        mask = self._valid if isinstance(self._valid, bytearray) else bytes(self._valid)
+        first = mask.find(1)
+        if first < 0:
+            return Column._from_buffers(Type.Float, array("d", bytes(8 * size)), bytearray(size))
+        
+        if skipna:
+            end = size
+            values = (self._data if mask.count(0) == 0 else
+                      [value if present else identity for value, present in zip(self._data, mask)])
+        else:
+            end = mask.find(0)
+            end = size if end < 0 else max(end, first)
+            values = self._data[:end]
+        
+        data = array("d", bytes(8 * first)) # preallocated result
+        data.extend(accumulate(islice(values, first, end), function))
+        data.frombytes(bytes(8 * (size - end)))
+        valid = bytearray(first) + b"\x01" * (end - first) + bytearray(size - end)
+        return Column._from_buffers(Type.Float, data, valid)
+
+    _ROLLING = ("mean", "sum", "min", "max", "std")
+
+    def rolling(self, window: int, op: str = "mean", skipna: bool = True) -> 'Column':
+        """
+        Mean, sum, minimum, maximum or (sample) standard deviation of float column
+        over sliding window of `window` items (computed in one pass, minimum and
+        maximum use monotonic deque). The result is None for incomplete windows at
+        the beginning and for windows without values. If `skipna` is False, the
+        result is None for all windows with None item.
+        :param window: size of window
+        :param op: "mean", "sum", "min", "max" or "std"
+        :param skipna: None items are skipped
+        :return: new column
+        """
+        assert self.dtype == Type.Float, "Rolling functions are defined only for float columns"
+        assert window > 0, "Window has to be positive"
+        if op not in Column._ROLLING:
+            raise ValueError("Unsupported rolling function " + op)
+        size = len(self)
+        data, valid = self._data, self._valid
+        result, result_valid = array("d", bytes(8 * size)), bytearray(size) # preallocated result
+        count = nulls = 0
+        # std uses Welford's updates of mean and M2 of values shifted by the first value
+        # (no cancellation of large offsets, e.g. 1e9 + 0.1 ... 1e9 + 0.4)
+        total = mean = m2 = 0.0
+        shift = next((data[i] for i in range(size) if valid[i]), 0.0)
+        candidates = deque() # indices of window items with monotonic values (for min/max)
+        better = operator.lt if op == "min" else operator.gt
+        for i in range(size):
+            if valid[i]:
+                value = data[i]
+                count += 1
+                total += value
+                if op == "std":
+                    delta = value - shift - mean
+                    mean += delta / count
+                    m2 += delta * (value - shift - mean)
+                if op in ("min", "max"):
+                    while candidates and not better(data[candidates[-1]], value):
+                        candidates.pop()
+                    candidates.append(i)
+            else:
+                nulls += 1
+            old = i - window
+            if old >= 0:
+                if valid[old]:
+                    value = data[old]
+                    count -= 1
+                    total -= value
+                    if count == 0:
+                        total = mean = m2 = 0.0 # no rounding errors are carried
+                    elif op == "std":
+                        delta = value - shift - mean
+                        mean -= delta / count
+                        m2 -= delta * (value - shift - mean)
+                else:
+                    nulls -= 1
+                if candidates and candidates[0] <= old:
+                    candidates.popleft()
+            if i < window - 1 or count == 0 or (nulls and not skipna):
+                continue
+
+            if op == "mean":
+                result[i] = total / count
+            elif op == "sum":
+                result[i] = total
+            elif op == "std":
+                if count < 2:
+                    continue
+                result[i] = sqrt(max(m2, 0.0) / (count - 1))
+            else:
+                result[i] = data[candidates[0]]
+            result_valid[i] = 1
+        return Column._from_buffers(Type.Float, result, result_valid)
+
+    def _sort_keys(self) -> List[Union[float, str, int]]:
+        """
+        Returns keys for sorting of rows by this column. Categorical columns are
+        sorted by integer ranks of their categories (None is the last).
+        """
+        if self._categories is None:
+            return list(self)
+        ranks = [0] * (len(self._categories) + 1)
+        for rank, code in enumerate(sorted(range(len(self._categories)),
+                                           key=self._categories.__getitem__)):
+            ranks[code] = rank
+        ranks[-1] = len(self._categories)
+        return [ranks[code] for code in self._data]
 
     def get_formatted_item(self, index: int, *, width: int):
         """
@@ -143,349 +912,2127 @@ class Column(MutableSequence):# implement MutableSequence (some method are mixed
         :return:
         """
         assert width > 0
-        if self._data[index] is None:
+        value = self[index]
+        if value is None:
             if self.dtype == Type.Float:
                 return "n/a".rjust(width)
             else:
                 return "n/a".ljust(width)
-        return format(self._data[index],
+        return format(value,
                       f"{width}s" if self.dtype == Type.String else f"-{width}.2g")
 
-class DataFrame:
+    # defined last, the name would shadow builtin `str` in annotations of the class body
+    @property
+    def str(self) -> 'StringMethods':
+        """
+        :return: vectorized string operations of String column (see `StringMethods`)
+        """
+        return StringMethods(self)
+
+
+class StringMethods:
     """
-    Dataframe with typed and named columns
+    Vectorized string operations of String column (accessor `Column.str`), eg.
+    `df.filter(df["Autor"].str.startswith("Č"))`. Tests return masks (None items
+    never satisfy them), transformations return new columns. For categorical
+    columns every operation is evaluated once per category and rows only look up
+    results by codes.
     """
-    def __init__(self, columns: Dict[str, Column]):
+    def __init__(self, column: Column):
+        assert column.dtype == Type.String, "String methods require String column"
+        self._column = column
+
+    def _table(self, function: Callable[[str], Any], missing: Any) -> List[Any]:
+        # results for all categories, code -1 (None) gets `missing`
+        return [function(value) for value in self._column._categories] + [missing]
+
+    def _mask(self, predicate: Callable[[str], bool]) -> Mask:
+        column = self._column
+        if column._categories is not None:
+            table = self._table(lambda value: bool(predicate(value)), False)
+            return Mask(bytearray(map(table.__getitem__, column._data)))
+        return Mask(value is not None and predicate(value) for value in column._data)
+
+    def contains(self, pattern: str, regex: bool = False) -> Mask:
         """
-        :param columns: columns of dataframe (key: name of dataframe),
-                        lengths of all columns has to be the same
+        :param pattern: searched substring (or regular expression)
+        :param regex: `pattern` is regular expression (searched anywhere in value)
+        :return: mask of items containing pattern
         """
-        assert len(columns) > 0, "Dataframe without columns is not supported"
-        self._size = common(len(column) for column in columns.values())
-        # deep copy od dict `columns`
-        self._columns = {name: column.copy() for name, column in columns.items()}
+        if regex:
+            return self._mask(re.compile(pattern).search)
+        return self._mask(lambda value: pattern in value)
 
-    def __getitem__(self, index: int) -> Tuple[Union[str,float]]:
+    def startswith(self, prefix: Union[str, Tuple[str, ...]]) -> Mask:
         """
-        Indexed getter returns row of dataframe as tuple
-        :param index: index of row
-        :return: tuple of items in row
+        :param prefix: prefix (or tuple of prefixes)
+        :return: mask of items starting with prefix
         """
-        try:
-            return tuple(c[index] for c in self._columns.values())
-        except IndexError:
-            print("Index out of bounds.")
-            
-    def __delitem__(self, index: int) -> None:
+        return self._mask(lambda value: value.startswith(prefix))
+
+    def match(self, pattern: Union[str, 're.Pattern']) -> Mask:
         """
-        Delete a row at the selected index from a DataFrame.
-        :param index: Index of the row to be deleted
+        :param pattern: regular expression (string or compiled), it has to match
+                        at the beginning of value
+        :return: mask of matching items
         """
-        try:
-            for col in self.columns:
-                del self._columns[col][index]
-            self._size -= 1
-        except IndexError:
-            print("Entry at index " + str(index) + " does not exist.")
-        ...
+        return self._mask(re.compile(pattern).match)
 
-    def __iter__(self) -> Iterator[Tuple[Union[str, float]]]:
+    def isin(self, values: Iterable[str]) -> Mask:
         """
-        :return: iterator over rows of dataframe
+        :param values: set of accepted values
+        :return: mask of items which are in `values`
         """
-        for i in range(len(self)):
-            yield tuple(c[i] for c in self._columns.values())
+        return self._mask(set(values).__contains__)
 
-    def __len__(self) -> int:
+    def lower(self) -> Column:
         """
-        :return: count of rows
+        :return: new column with lowercase items (categorical for categorical column)
         """
-        return self._size
+        column = self._column
+        if column._categories is None:
+            return Column._from_buffers(Type.String, [None if value is None else value.lower()
+                                                      for value in column._data])
+        # lowercase categories can coincide, codes are remapped to distinct values
+        lookup = {}
+        remap = self._table(lambda value: lookup.setdefault(value.lower(), len(lookup)), -1)
+        return Column._from_buffers(Type.String, array("i", map(remap.__getitem__, column._data)),
+                                    categories=list(lookup))
 
-    @property
-    def columns(self) -> Iterable[str]:
+    def len(self) -> Column:
         """
-        :return: names of columns (as iterable object)
+        :return: new Float column with lengths of items
         """
-        return self._columns.keys()
+        column = self._column
+        if column._categories is not None:
+            table = self._table(len, None)
+            return Column(map(table.__getitem__, column._data), Type.Float)
+        return Column([None if value is None else len(value) for value in column._data], Type.Float)
 
-    def __repr__(self) -> str:
+
+class QuantileSketch:
+    """
+    Mergeable sketch for approximate quantiles (simplified KLL sketch). Level `h`
+    holds items with weight `2 ** h`; when a level has more than `k` items, they are
+    sorted and every other item (with random offset) is promoted to the next level.
+    Memory is `O(k * log(n / k))`.
+    """
+    def __init__(self, k: int = 256):
+        assert k >= 2, "Capacity of levels has to be at least 2"
+        self.k = k
+        self.count = 0
+        self._levels = [[]]
+        self._rng = random.Random(k) # deterministic compaction
+
+    def update(self, values: Iterable[float]) -> 'QuantileSketch':
         """
-        :return: string representation of dataframe (table with aligned columns)
+        Adds values.
+        :return: self
         """
-        lines = []
-        lines.append(" ".join(f"{name:12s}" for name in self.columns))
-        for i in range(len(self)):
-            lines.append(" ".join(self._columns[cname].get_formatted_item(i, width=12)
-                                     for cname in self.columns))
-        return "\n".join(lines)
-    
-    def _skeleton(self) -> 'DataFrame':
+        level = self._levels[0]
+        size = len(level)
+        level.extend(values)
+        self.count += len(level) - size
+        self._compress()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
         """
-        Returns a new DataFrame which copies the input DataFrame structure (names and dtypes of columns) but excludes data
-        :return: new empty dataframe with identical column structure 
+        Adds values summarized by other sketch.
+        :return: self
         """
-        dtypes = []
-        
-        for key in self.columns:
-            dtypes.append(self._columns[key].dtype)
-            
-        return DataFrame({key: Column([], dtype) for key, dtype in zip(self.columns, dtypes)})    
+        for height, items in enumerate(other._levels):
+            if height == len(self._levels):
+                self._levels.append([])
+            self._levels[height].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
 
-    def append_column(self, col_name:str, column: Column) -> None:
+    def _compress(self) -> None:
+        height = 0
+        while height < len(self._levels):
+            items = self._levels[height]
+            if len(items) > self.k:
+                items.sort()
+                # odd item stays at the current level
+                self._levels[height] = [items.pop()] if len(items) % 2 else []
+                if height + 1 == len(self._levels):
+                    self._levels.append([])
+                self._levels[height + 1].extend(items[self._rng.getrandbits(1)::2])
+            height += 1
+
+    def quantile(self, q: float) -> Union[float, None]:
         """
-        Appends new column to dataframe (its name has to be unique).
-        :param col_name:  name of new column
-        :param column: data of new column
+        :param q: quantile (number between 0 and 1)
+        :return: approximate quantile (None if there are no values)
         """
-        if col_name in self._columns:
-            raise ValueError("Duplicate column name")
-        self._columns[col_name] = column.copy()
+        assert 0 <= q <= 1, "Quantile has to be between 0 and 1"
+        items = sorted((value, 1 << height) for height, level in enumerate(self._levels)
+                       for value in level)
+        if not items:
+            return None
+        target = q * sum(weight for _, weight in items)
+        cumulative = 0
+        for value, weight in items:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return items[-1][0]
 
-    def append_row(self, row: Iterable) -> None:
+
+class ColumnStats:
+    """
+    Statistics of float column (count of values and of None items, sum, min, max,
+    mean, standard deviation and approximate quantiles). Mean and variance are
+    accumulated by Welford's (Chan's) algorithm and quantiles by `QuantileSketch`,
+    so statistics are mergeable: they can be folded over chunks of data (see
+    `DataFrame.stream_stats`) or combined from parallel workers.
+    """
+    def __init__(self):
+        self.count = 0
+        self.null_count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._mean = 0.0
+        self._m2 = 0.0 # sum of squared deviations from mean
+        self._sketch = QuantileSketch()
+
+    def update(self, column: Column) -> 'ColumnStats':
         """
-        Appends new row to dataframe.
-        :param row: tuple of values for all columns
+        Adds values of column to statistics.
+        :param column: float column
+        :return: self
         """
-        assert len(row) == len(self.columns), "Input does not match the number of columns in this DataFrame."
-        
-        li = list(row)
-        
-        for key in self.columns:
-            self._columns[key].append(li.pop(0))
-            
-        self._size += 1
+        assert column.dtype == Type.Float, "Statistics are computed only for float columns"
+        values = array("d", compress(column._data, column._valid))
+        self.null_count += len(column) - len(values)
+        if values:
+            batch = ColumnStats()
+            batch.count, batch.sum = len(values), sum(values)
+            batch.min, batch.max = min(values), max(values)
+            batch._mean = batch.sum / batch.count
+            batch._m2 = sum((value - batch._mean) ** 2 for value in values)
+            batch._sketch.update(values)
+            self.merge(batch)
+        return self
 
-    def filter(self, col_name:str,
-               predicate: Callable[[Union[float, str]], bool]) -> 'DataFrame':
+    def merge(self, other: 'ColumnStats') -> 'ColumnStats':
         """
-        Returns new dataframe with rows which values in column `col_name` returns
-        True in function `predicate`.
+        Adds statistics of other values.
+        :param other: statistics of other values
+        :return: self
+        """
+        self.null_count += other.null_count
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.min, self.max = other.min, other.max
+            self._mean, self._m2 = other._mean, other._m2
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            count = self.count + other.count
+            delta = other._mean - self._mean
+            self._mean += delta * other.count / count
+            self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count += other.count
+        self.sum += other.sum
+        self._sketch.merge(other._sketch)
+        return self
 
-        :param col_name: name of tested column
-        :param predicate: testing function
-        :return: new dataframe
+    @property
+    def mean(self) -> Union[float, None]:
         """
-        assert col_name in self.columns, "DataFrame doesn't contain " + col_name + " column."
+        :return: mean of values (None if there are no values)
+        """
+        return self._mean if self.count else None
+
+    @property
+    def std(self) -> Union[float, None]:
+        """
+        :return: sample standard deviation of values (None for less than two values)
+        """
+        return sqrt(self._m2 / (self.count - 1)) if self.count > 1 else None
+
+    def quantile(self, q: float) -> Union[float, None]:
+        """
+        :param q: quantile (number between 0 and 1)
+        :return: approximate quantile (min and max are exact)
+        """
+        if q == 0:
+            return self.min
+        if q == 1:
+            return self.max
+        return self._sketch.quantile(q)
+
+    def __repr__(self) -> str:
+        return (f"ColumnStats(count={self.count}, null_count={self.null_count}, sum={self.sum}, "
+                f"min={self.min}, max={self.max}, mean={self.mean}, std={self.std})")
+
+
+def _random_generator(random_state: Union[int, random.Random, None]) -> Union[random.Random, Any]:
+    """
+    :return: random generator for seed (module `random` for None)
+    """
+    if random_state is None:
+        return random
+    if isinstance(random_state, random.Random):
+        return random_state
+    return random.Random(random_state)
+
+
+def _open_uniform(rng: Union[random.Random, Any]) -> float:
+    """
+    :return: random number from open interval (0, 1)
+    """
+    value = rng.random()
+    while value == 0.0:
+        value = rng.random()
+    return value
+
+
+class HyperLogLog:
+    """
+    Sketch for approximate counting of distinct values (HyperLogLog with `2 ** precision`
+    one-byte registers). Hashes are deterministic, so sketches of parts of data
+    (eg. chunks or partitions) can be merged.
+    """
+    _MASK = (1 << 64) - 1
+
+    def __init__(self, precision: int = 12):
+        assert 4 <= precision <= 18, "Precision has to be between 4 and 18"
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    @staticmethod
+    def _hash(value: Union[float, str]) -> int:
+        """
+        :return: 64-bit hash of value (strings are hashed by blake2b, floats by
+                 builtin hash mixed by splitmix64 finalizer)
+        """
+        if isinstance(value, str):
+            return int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+        x = hash(value) & HyperLogLog._MASK
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & HyperLogLog._MASK
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & HyperLogLog._MASK
+        return x ^ (x >> 31)
+
+    def update(self, values: Iterable[Union[float, str]]) -> 'HyperLogLog':
+        """
+        Adds values (None values are skipped).
+        :return: self
+        """
+        registers = self._registers
+        bits = 64 - self.precision
+        low = (1 << bits) - 1
+        for value in values:
+            if value is None:
+                continue
+            x = HyperLogLog._hash(value)
+            index = x >> bits
+            rank = bits - (x & low).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        Adds values counted by other sketch (with the same precision).
+        :return: self
+        """
+        assert other.precision == self.precision, "Sketches have different precision"
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def count(self) -> int:
+        """
+        :return: estimated number of distinct values
+        """
+        m = len(self._registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -rank for rank in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * log(m / zeros) # small range correction
+        return round(estimate)
+
+
+class Index:
+    """
+    Secondary index on key column(s) of dataframe (see `DataFrame.create_index`)
+    mapping keys to row positions. Hash index is a dictionary (key -> sorted list
+    of rows) for equality lookups in O(1), sorted index keeps keys in sorted order
+    for equality and range lookups in O(log n). Composite keys are tuples, rows
+    with None in key are not indexed.
+
+    Lookups are `loc`-like, eg. `index[1961.0]` returns rows of key 1961 and
+    `index[1961.0:1970.0]` rows of keys between 1961 and 1970 (inclusive).
+    """
+    KINDS = ("hash", "sorted")
+
+    def __init__(self, names: List[str], kind: str, keys: Iterable):
+        """
+        :param names: names of key columns
+        :param kind: "hash" or "sorted"
+        :param keys: keys of all rows (tuples for composite keys)
+        """
+        if kind not in Index.KINDS:
+            raise ValueError("Unsupported kind of index " + str(kind))
+        self.names = names
+        self.kind = kind
+        self._entries = {}
+        self._keys, self._rows = [], []
+        indexed = [(key, row) for row, key in enumerate(keys) if not Index._missing(key)]
+        if kind == "hash":
+            setdefault = self._entries.setdefault
+            for key, row in indexed:
+                setdefault(key, []).append(row)
+        elif indexed:
+            # stable sort keeps rows of equal keys in ascending order
+            indexed.sort(key=operator.itemgetter(0))
+            self._keys, self._rows = map(list, zip(*indexed))
+
+    @staticmethod
+    def _missing(key: Any) -> bool:
+        return key is None or (isinstance(key, tuple) and None in key)
+
+    def __len__(self) -> int:
+        """
+        :return: number of indexed rows
+        """
+        if self.kind == "hash":
+            return sum(map(len, self._entries.values()))
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return f"Index({self.names}, kind={self.kind!r})"
+
+    def __getitem__(self, key: Union[Any, slice]) -> List[int]:
+        """
+        :param key: value of key (tuple for composite keys) or slice of keys
+        :return: ascending row positions
+        """
+        if isinstance(key, slice):
+            assert key.step is None, "Step of range lookup is not supported"
+            return self.range(key.start, key.stop)
+        return self.get(key)
+
+    def get(self, key: Any) -> List[int]:
+        """
+        Equality lookup.
+        :param key: value of key (tuple for composite keys)
+        :return: ascending row positions of rows with the key
+        """
+        if self.kind == "hash":
+            return list(self._entries.get(key, ()))
+        if Index._missing(key):
+            return []
+        return self._rows[bisect_left(self._keys, key):bisect_right(self._keys, key)]
+
+    def range(self, low: Any = None, high: Any = None) -> List[int]:
+        """
+        Range lookup (only for sorted index).
+        :param low: the lowest key (None for unbounded range)
+        :param high: the highest key (None for unbounded range)
+        :return: ascending row positions of rows with keys between `low` and `high` (inclusive)
+        """
+        if self.kind != "sorted":
+            raise ValueError("Range lookups require sorted index")
+        start = 0 if low is None else bisect_left(self._keys, low)
+        stop = len(self._keys) if high is None else bisect_right(self._keys, high)
+        return sorted(self._rows[start:stop])
+
+    def _insert(self, key: Any, row: int) -> None:
+        if Index._missing(key):
+            return
+        if self.kind == "hash":
+            insort(self._entries.setdefault(key, []), row)
+            return
+        start, stop = bisect_left(self._keys, key), bisect_right(self._keys, key)
+        position = bisect(self._rows, row, start, stop)
+        self._keys.insert(position, key)
+        self._rows.insert(position, row)
+
+    def _remove(self, key: Any, row: int) -> None:
+        if Index._missing(key):
+            return
+        if self.kind == "hash":
+            rows = self._entries[key]
+            del rows[bisect_left(rows, row)]
+            if not rows:
+                del self._entries[key]
+            return
+        start, stop = bisect_left(self._keys, key), bisect_right(self._keys, key)
+        position = bisect_left(self._rows, row, start, stop)
+        del self._keys[position]
+        del self._rows[position]
+
+    def _delete(self, key: Any, row: int) -> None:
+        """
+        Removes deleted row and shifts positions of following rows (in one pass).
+        """
+        self._remove(key, row)
+        if self.kind == "hash":
+            for rows in self._entries.values():
+                if rows[-1] > row:
+                    rows[:] = [item - (item > row) for item in rows]
+        else:
+            self._rows = [item - (item > row) for item in self._rows]
+
+
+class DataFrame:
+    """
+    Dataframe with typed and named columns
+    """
+    def __init__(self, columns: Dict[str, Column]):
+        """
+        :param columns: columns of dataframe (key: name of dataframe),
+                        lengths of all columns has to be the same
+        """
+        assert len(columns) > 0, "Dataframe without columns is not supported"
+        self._size = common(len(column) for column in columns.values())
+        # copy od dict `columns` (columns share data until they are modified)
+        self._columns = {name: column.copy() for name, column in columns.items()}
+        self._indexes = {}
+
+    @staticmethod
+    def _from_columns(columns: Dict[str, Column]) -> 'DataFrame':
+        """
+        Creates dataframe from freshly created columns (columns are not copied).
+        """
+        df = DataFrame.__new__(DataFrame)
+        df._size = common(len(column) for column in columns.values())
+        df._columns = dict(columns)
+        df._indexes = {}
+        return df
+
+    def __getitem__(self, index: Union[int, str]) -> Union[Tuple[Union[str,float]], Column]:
+        """
+        Indexed getter returns row of dataframe as tuple (for integer index)
+        or column of dataframe (for name of column, eg. `df["rok"] == 1961` is a mask).
+        Column is returned as copy (in constant time, see `Column.copy`), so changes
+        of returned column do not bypass size and indexes of dataframe.
+        :param index: index of row or name of column
+        :return: tuple of items in row or column
+        """
+        if isinstance(index, str):
+            return self._columns[index].copy()
+        try:
+            return tuple(c[index] for c in self._columns.values())
+        except IndexError:
+            print("Index out of bounds.")
+            
+    @_traced
+    def __delitem__(self, index: int) -> None:
+        """
+        Delete a row at the selected index from a DataFrame.
+        :param index: Index of the row to be deleted
+        """
+        try:
+            row = range(len(self))[index]
+            for key_index in self._indexes.values():
+                key_index._delete(self._key(key_index.names, row), row)
+            for col in self.columns:
+                del self._columns[col][row]
+            self._size -= 1
+        except IndexError:
+            print("Entry at index " + str(index) + " does not exist.")
+        ...
+
+    def __iter__(self) -> Iterator[Tuple[Union[str, float]]]:
+        """
+        :return: iterator over rows of dataframe
+        """
+        for i in range(len(self)):
+            yield tuple(c[i] for c in self._columns.values())
+
+    def __len__(self) -> int:
+        """
+        :return: count of rows
+        """
+        return self._size
+
+    @property
+    def columns(self) -> Iterable[str]:
+        """
+        :return: names of columns (as iterable object)
+        """
+        return self._columns.keys()
+
+    repr_rows = 20  # longer dataframes are shown by first and last rows
+
+    @_traced
+    def __repr__(self) -> str:
+        """
+        :return: string representation of dataframe (table with aligned columns),
+                 dataframes longer than `repr_rows` are truncated (see `to_string`)
+        """
+        return self.to_string(max_rows=self.repr_rows)
+
+    @_traced
+    def to_string(self, file: Union[TextIO, Path, str, None] = None, *, max_rows: int = None,
+                  block_rows: int = 65536) -> Union[str, None]:
+        """
+        Formats dataframe as table with aligned columns (numbers are right aligned,
+        strings left aligned, widths of columns fit the longest shown item).
+        Dataframe with more than `max_rows` rows is shown by its first and last rows
+        and a footer with its size. Rows are formatted and written in blocks (widths
+        are computed by the first pass), so memory does not grow with size of dataframe.
+        :param file: text file or path (None returns the table as string)
+        :param max_rows: maximal number of shown rows (None shows all rows)
+        :param block_rows: number of rows formatted at once
+        :return: table (None when written to file)
+        """
+        if file is None:
+            output = io.StringIO()
+            self.to_string(output, max_rows=max_rows, block_rows=block_rows)
+            return output.getvalue()[:-1]
+        if isinstance(file, (str, Path)):
+            with open(file, "w", encoding="utf-8") as output:
+                self.to_string(output, max_rows=max_rows, block_rows=block_rows)
+            return None
+
+        size = len(self)
+        parts = [range(size)]
+        if max_rows is not None and size > max_rows:
+            head = (max_rows + 1) // 2
+            parts = [range(head), range(size - (max_rows - head), size)]
+        blocks = [[part[start:start + block_rows] for start in range(0, len(part), block_rows)]
+                  for part in parts]
+
+        columns = list(self._columns.values())
+        widths = [max(len(name), 3) for name in self.columns]
+        for block in chain.from_iterable(blocks):
+            for position, column in enumerate(columns):
+                widths[position] = max(widths[position], *map(len, DataFrame._cells(column, block)))
+
+        def justify(texts: Iterable[str], column: Column, width: int) -> List[str]:
+            pad = str.rjust if column.dtype == Type.Float else str.ljust
+            return [pad(text, width) for text in texts]
+
+        file.write(" ".join(justify([name], column, width)[0] for name, column, width
+                            in zip(self.columns, columns, widths)).rstrip() + "\n")
+        for part, part_blocks in enumerate(blocks):
+            if part > 0:
+                file.write(" ".join(justify(["..."], column, width)[0]
+                                    for column, width in zip(columns, widths)).rstrip() + "\n")
+            for block in part_blocks:
+                cells = [justify(DataFrame._cells(column, block), column, width)
+                         for column, width in zip(columns, widths)]
+                file.write("".join(" ".join(row).rstrip() + "\n" for row in zip(*cells)))
+        if len(parts) > 1:
+            file.write(f"\n[{size} rows x {len(columns)} columns]\n")
+        return None
+
+    @staticmethod
+    def _cells(column: Column, rows: range) -> List[str]:
+        # formatted items without padding
+        return [column.get_formatted_item(row, width=1) for row in rows]
+
+    @_traced
+    def to_csv(self, file: Union[TextIO, Path, str], *, header: bool = True,
+               dialect: Union[str, csv.Dialect] = "excel", block_rows: int = 65536) -> None:
+        """
+        Writes dataframe to CSV file (None values are written as empty fields). Rows
+        are written in blocks, so memory does not grow with size of dataframe.
+        :param file: text file (opened with `newline=""`) or path
+        :param header: the first line contains names of columns
+        :param dialect: dialect of `csv` module, eg. "unix"
+        :param block_rows: number of rows written at once
+        """
+        if isinstance(file, (str, Path)):
+            with open(file, "w", newline="", encoding="utf-8") as output:
+                self.to_csv(output, header=header, dialect=dialect, block_rows=block_rows)
+            return
+
+        writer = csv.writer(file, dialect)
+        if header:
+            writer.writerow(self.columns)
+        rows = zip(*self._columns.values())
+        for block in iter(lambda: list(islice(rows, block_rows)), []):
+            writer.writerows(block)
+
+    def _skeleton(self) -> 'DataFrame':
+        """
+        Returns a new DataFrame which copies the input DataFrame structure (names and dtypes of columns) but excludes data
+        :return: new empty dataframe with identical column structure 
+        """
+        return DataFrame({key: Column([], column.dtype, categorical=column.categorical)
+                          for key, column in self._columns.items()})
+
+    @_traced
+    def append_column(self, col_name:str, column: Column) -> None:
+        """
+        Appends new column to dataframe (its name has to be unique).
+        :param col_name:  name of new column
+        :param column: data of new column
+        """
+        if col_name in self._columns:
+            raise ValueError("Duplicate column name")
+        self._columns[col_name] = column.copy()
+
+    @_traced
+    def append_row(self, row: Iterable) -> None:
+        """
+        Appends new row to dataframe.
+        :param row: tuple of values for all columns
+        """
+        assert len(row) == len(self.columns), "Input does not match the number of columns in this DataFrame."
+        
+        for column, value in zip(self._columns.values(), row):
+            column.append(value)
+            
+        self._size += 1
+        self._index_rows(self._size - 1)
+
+    @_traced
+    def append_rows(self, rows: Iterable[Iterable]) -> None:
+        """
+        Appends batch of rows to dataframe (rows are transposed once and every
+        column is extended in bulk).
+        :param rows: tuples of values for all columns
+        """
+        rows = list(rows)
+        for row in rows:
+            assert len(row) == len(self.columns), "Input does not match the number of columns in this DataFrame."
+        
+        columns = list(self._columns.values())
+        # all values are cast before the first column is modified (a bad value
+        # leaves dataframe unchanged), packing can not fail then
+        values = [[column._cast(value) for value in column_values]
+                  for column, column_values in zip(columns, zip(*rows))]
+        packed = []
+        for column, column_values in zip(columns, values):
+            column._writable()
+            packed.append(column._pack(column_values, cast=False))
+        for column, (data, valid) in zip(columns, packed):
+            column._data.extend(data)
+            if valid is not None:
+                column._valid.extend(valid)
+        
+        self._size += len(rows)
+        self._index_rows(self._size - len(rows))
+
+    @staticmethod
+    @_traced
+    def from_rows(rows: Iterable[Iterable], schema: Dict[str, Type]) -> 'DataFrame':
+        """
+        Creates dataframe from rows.
+        :param rows: tuples of values for all columns
+        :param schema: names and types of columns (in order of values in rows)
+        :return: new dataframe
+        """
+        assert len(schema) > 0, "Dataframe without columns is not supported"
+        rows = list(rows)
+        for row in rows:
+            assert len(row) == len(schema), "Input does not match the number of columns in schema."
+        
+        values = list(zip(*rows)) or [()] * len(schema)
+        return DataFrame._from_columns({name: Column(column_values, dtype)
+                                        for (name, dtype), column_values in zip(schema.items(), values)})
+
+    @staticmethod
+    @_traced
+    def concat(frames: Iterable['DataFrame']) -> 'DataFrame':
+        """
+        Joins data from DataFrames with identical column structure into a new DataFrame
+        (every column is allocated once).
+        :param frames: dataframes with identical names and types of columns
+        :return: new dataframe containing data from all input dataframes
+        """
+        frames = list(frames)
+        assert len(frames) > 0, "There are no dataframes"
+        for df in frames[1:]:
+            assert df.columns == frames[0].columns, "Input DataFrames do not match in structures"
+            for name in df.columns:
+                assert df._columns[name].dtype == frames[0]._columns[name].dtype, \
+                    "Column " + name + " has different types in input DataFrames"
+        
+        return DataFrame._from_columns({name: Column._concat([df._columns[name] for df in frames])
+                                        for name in frames[0].columns})
+
+    @_traced
+    def filter(self, col_name: Union[str, Mask],
+               predicate: Callable[[Union[float, str]], bool] = None) -> 'DataFrame':
+        """
+        Returns new dataframe with rows which values in column `col_name` returns
+        True in function `predicate`.
+        Instead of column name and predicate a boolean mask can be used
+        (eg. `df.filter((df["rok"] == 1961) & (df["mesic"] < 6))`).
+
+        :param col_name: name of tested column (or mask)
+        :param predicate: testing function
+        :return: new dataframe
+        """
+        if isinstance(col_name, Mask):
+            mask = col_name
+            assert len(mask) == len(self), "Mask has different length than dataframe"
+        else:
+            assert col_name in self.columns, "DataFrame doesn't contain " + col_name + " column."
+            mask = Mask(self._columns[col_name]._matches(predicate))
+        
+        return DataFrame._from_columns({name: column.compress(mask)
+                                        for name, column in self._columns.items()})
+
+
+    @_traced
+    def sort(self, by: Union[str, List[str]] = None, ascending: Union[bool, List[bool]] = True,
+             na_position: str = "last", *, col_name: str = None) -> 'DataFrame':
+        """
+        Sort dataframe by key column `by` ascending or descending.
+        Dataframe can be sorted by more columns (eg. `sort(["rok", "mesic"], [False, True])`),
+        sorting is stable.
+        :param by: name of key column (or list of names)
+        :param ascending: direction of sorting (or list of directions for all key columns)
+        :param na_position: position of None values ("first" or "last")
+        :param col_name: former name of parameter `by` (kept for compatibility)
+        :return: new dataframe
+        """
+        by = DataFrame._sort_keys(by, col_name)
+        order = self._argsort(by, ascending, na_position)
+        return DataFrame._from_columns({name: column.permute(order)
+                                        for name, column in self._columns.items()})
+
+    @staticmethod
+    def _sort_keys(by: Union[str, List[str], None], col_name: Union[str, None]) -> Union[str, List[str]]:
+        if (by is None) == (col_name is None):
+            raise TypeError("sort() requires exactly one of `by` and `col_name`")
+        return col_name if by is None else by
+
+    def _argsort(self, by: Union[str, List[str]], ascending: Union[bool, List[bool]] = True,
+                 na_position: str = "last", rows: List[int] = None) -> List[int]:
+        """
+        Returns indices of rows in sorted order (see `sort`), rows are sorted by
+        the least significant key first.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        ascending = [ascending] * len(by) if isinstance(ascending, bool) else list(ascending)
+        assert len(ascending) == len(by), "Number of directions does not match number of key columns"
+        for name in by:
+            assert name in self.columns, "DataFrame doesn't contain " + name + " column."
+        for name, direction in zip(reversed(by), reversed(ascending)):
+            rows = self._columns[name].argsort(direction, na_position, rows)
+        return rows
+
+    @_traced
+    def describe(self, percentiles: Iterable[float] = (0.25, 0.5, 0.75)) -> 'DataFrame':
+        """
+        similar to pandas: count, count of None values, mean, standard deviation, min,
+        approximate percentiles and max for all float columns (statistics of every
+        column are computed in one pass, see `ColumnStats`).
+        :param percentiles: computed percentiles (numbers between 0 and 1)
+        :return: new dataframe with column "statistic" (names of statistics) and
+                 one column for every float column
+        """
+        return DataFrame.describe_stats(DataFrame.stream_stats([self]), percentiles)
+
+    @staticmethod
+    def describe_stats(stats: Dict[str, ColumnStats],
+                       percentiles: Iterable[float] = (0.25, 0.5, 0.75)) -> 'DataFrame':
+        """
+        Description (see `describe`) from statistics, eg. merged from chunks
+        `DataFrame.describe_stats(DataFrame.stream_stats(DataFrame.iter_chunks(path, 10000)))`.
+        :param stats: statistics of columns (name -> statistics)
+        :param percentiles: computed percentiles (numbers between 0 and 1)
+        :return: new dataframe
+        """
+        percentiles = list(percentiles)
+        names = (["count", "null_count", "mean", "std", "min"]
+                 + [f"{100 * q:g}%" for q in percentiles] + ["max"])
+        columns = {"statistic": Column(names, Type.String)}
+        for name, column_stats in stats.items():
+            columns[name] = Column([column_stats.count, column_stats.null_count,
+                                    column_stats.mean, column_stats.std, column_stats.min]
+                                   + [column_stats.quantile(q) for q in percentiles]
+                                   + [column_stats.max], Type.Float)
+        return DataFrame._from_columns(columns)
+
+    @_traced
+    def inner_join(self, other: 'DataFrame', self_key_column: str,
+                   other_key_column: str, *, method: str = "hash") -> 'DataFrame':
+        """
+            Inner join between self and other dataframe with join predicate
+            `self.key_column == other.key_column`.
+
+            Possible collision of column identifiers is resolved by prefixing `_other` to
+            columns from `other` data table.
+
+            Hash join (`method="hash"`) builds hash table on the smaller dataframe and
+            probes it by rows of the larger one (rows of result follow the order of
+            the larger dataframe). Sort-merge join (`method="merge"`) can be used for
+            dataframes already sorted by key columns (rows follow the order of keys).
+            None keys never match.
+        """
+        return self._join(other, self_key_column, other_key_column, "inner", method)
+
+    @_traced
+    def left_join(self, other: 'DataFrame', self_key_column: str,
+                  other_key_column: str, *, method: str = "hash") -> 'DataFrame':
+        """
+            Left outer join (see `inner_join`), rows from self without matching row
+            in other are included with None values in columns from other.
+        """
+        return self._join(other, self_key_column, other_key_column, "left", method)
+
+    @_traced
+    def outer_join(self, other: 'DataFrame', self_key_column: str,
+                   other_key_column: str, *, method: str = "hash") -> 'DataFrame':
+        """
+            Full outer join (see `inner_join`), rows without matching row in other
+            dataframe are included from both dataframes (with None values).
+        """
+        return self._join(other, self_key_column, other_key_column, "outer", method)
+
+    def _join(self, other: 'DataFrame', self_key_column: str, other_key_column: str,
+              how: str, method: str) -> 'DataFrame':
+        assert self_key_column in self.columns, "DataFrame doesn't contain " + self_key_column + " column."
+        assert other_key_column in other.columns, "DataFrame doesn't contain " + other_key_column + " column."
+
+        left_keys = list(self._columns[self_key_column])
+        right_keys = list(other._columns[other_key_column])
+        if method == "hash":
+            left, right = DataFrame._hash_join(left_keys, right_keys)
+        elif method == "merge":
+            left, right = DataFrame._merge_join(left_keys, right_keys)
+        else:
+            raise ValueError("Unknown join method " + method)
+
+        if how in ("left", "outer"):
+            matched = bytearray(len(self))
+            for index in left:
+                matched[index] = 1
+            unmatched = [index for index in range(len(self)) if not matched[index]]
+            left.extend(unmatched)
+            right.extend([None] * len(unmatched))
+        if how == "outer":
+            matched = bytearray(len(other))
+            for index in right:
+                if index is not None:
+                    matched[index] = 1
+            unmatched = [index for index in range(len(other)) if not matched[index]]
+            left.extend([None] * len(unmatched))
+            right.extend(unmatched)
+
+        logger.info("%s %s join: %d x %d rows -> %d rows", how, method,
+                    len(self), len(other), len(left))
+
+        columns = {name: column.permute(left) for name, column in self._columns.items()}
+        for name, column in other._columns.items():
+            while name in columns:
+                name = "_other" + name # prefixed name can collide too
+            columns[name] = column.permute(right)
+        return DataFrame._from_columns(columns)
+
+    @staticmethod
+    def _hash_join(left_keys: List, right_keys: List) -> Tuple[List[int], List[int]]:
+        """
+        Returns pairs of indices of matching rows (as two lists).
+        """
+        build_left = len(left_keys) < len(right_keys)
+        build_keys, probe_keys = (left_keys, right_keys) if build_left else (right_keys, left_keys)
+
+        table = {}
+        for index, key in enumerate(build_keys):
+            if key is not None:
+                table.setdefault(key, []).append(index)
+
+        build, probe = [], []
+        for index, key in enumerate(probe_keys):
+            if key is None:
+                continue
+            matches = table.get(key)
+            if matches:
+                build.extend(matches)
+                probe.extend([index] * len(matches))
+
+        logger.info("hash join: build side %d rows (%d keys), probe side %d rows, %d matches",
+                    len(build_keys), len(table), len(probe_keys), len(build))
+        return (build, probe) if build_left else (probe, build)
+
+    @staticmethod
+    def _merge_join(left_keys: List, right_keys: List) -> Tuple[List[int], List[int]]:
+        """
+        Returns pairs of indices of matching rows (as two lists), keys has to be sorted.
+        """
+        left_keys = [(key, index) for index, key in enumerate(left_keys) if key is not None]
+        right_keys = [(key, index) for index, key in enumerate(right_keys) if key is not None]
+        for keys in (left_keys, right_keys):
+            if any(keys[i][0] > keys[i + 1][0] for i in range(len(keys) - 1)):
+                raise ValueError("Merge join requires key columns sorted in ascending order")
+
+        left, right = [], []
+        i = j = 0
+        while i < len(left_keys) and j < len(right_keys):
+            key = left_keys[i][0]
+            if key < right_keys[j][0]:
+                i += 1
+            elif key > right_keys[j][0]:
+                j += 1
+            else:
+                i_end, j_end = i, j
+                while i_end < len(left_keys) and left_keys[i_end][0] == key:
+                    i_end += 1
+                while j_end < len(right_keys) and right_keys[j_end][0] == key:
+                    j_end += 1
+                for _, left_index in left_keys[i:i_end]:
+                    left.extend([left_index] * (j_end - j))
+                    right.extend(index for _, index in right_keys[j:j_end])
+                i, j = i_end, j_end
+
+        logger.info("merge join: left side %d rows, right side %d rows, %d matches",
+                    len(left_keys), len(right_keys), len(left))
+        return left, right
+        
+    @_traced
+    def extend(self, *donor_df: 'DataFrame') -> 'DataFrame':
+        """
+        Joins data from DataFrames with identical column structure into a new DataFrame
+        :return: new dataframe containing data from all input dataframes
+        """
+        return DataFrame.concat((self,) + donor_df)
+        
+
+    @_traced
+    def setvalue(self, col_name: str, row_index: int, value: Any) -> None:
+        """
+        Set new value in dataframe.
+        :param col_name:  name of culumns
+        :param row_index: index of row
+        :param value:  new value (value is cast to type of column)
+        :return:
+        """
+        col = self._columns[col_name]
+        row_index = range(len(self))[row_index]
+        value = col._cast(value) # indexes are not touched when value can not be cast
+        changed = [index for index in self._indexes.values() if col_name in index.names]
+        for index in changed:
+            index._remove(self._key(index.names, row_index), row_index)
+        col[row_index] = value
+        for index in changed:
+            index._insert(self._key(index.names, row_index), row_index)
+    
+    @_traced
+    def sum_by(self, category_column, data_columns: Iterable):
         
-        ret_df = self._skeleton()
-        index = list(self.columns).index(col_name)
+        #input check
+        assert category_column in self.columns, "DataFrame doesn't contain " + category_column + " column."
         
-        for row in iter(self):
-            if predicate(row[index]):
-                ret_df.append_row(row)
-                
-        return ret_df
+        data_columns = list(data_columns)
+        for key in data_columns:
+            assert key in self.columns, "DataFrame doesn't contain " + key + " column."
+            assert self._columns[key].dtype == Type.Float, "Data column " + key + " is not a float type."
+        
+        #one row for each category (None excluded), sums of data columns
+        totals = self.groupby(category_column).agg({dc: ["sum"] for dc in data_columns})
+        
+        columns = {"Cat(" + category_column + ")": totals._columns[category_column]}
+        for dc in data_columns:
+            columns[dc] = totals._columns["sum(" + dc + ")"]
+               
+        return DataFrame._from_columns(columns)
+
+    def groupby(self, keys: Union[str, List[str]]) -> 'GroupBy':
+        """
+        Groups rows by values of key column(s), eg.
+        `df.groupby(["rok", "mesic"]).agg({"X1.": ["mean", "max"]})`.
+        :param keys: name of key column or list of names (composite key)
+        :return: grouping which can be aggregated by `GroupBy.agg`
+        """
+        return GroupBy(self, [keys] if isinstance(keys, str) else list(keys))
+    
+    
+            
+    @_traced
+    def cummin(self, colname, skipna=True) -> Column:
+        """
+        Cumulative minimum of float column (see `Column.cumulative`).
+        :param colname: name of column
+        :param skipna: None values are skipped (otherwise the rest of result is None)
+        :return: new column
+        """
+        assert colname in self.columns, "Dataframe doesn't contain " + colname + " column."
+        return self._columns[colname].cumulative("min", skipna)
+
+    @_traced
+    def cummax(self, colname, skipna=True) -> Column:
+        """
+        Cumulative maximum of float column (see `Column.cumulative`).
+        """
+        assert colname in self.columns, "Dataframe doesn't contain " + colname + " column."
+        return self._columns[colname].cumulative("max", skipna)
+
+    @_traced
+    def cumsum(self, colname, skipna=True) -> Column:
+        """
+        Cumulative sum of float column (see `Column.cumulative`).
+        """
+        assert colname in self.columns, "Dataframe doesn't contain " + colname + " column."
+        return self._columns[colname].cumulative("sum", skipna)
+
+    @_traced
+    def cumprod(self, colname, skipna=True) -> Column:
+        """
+        Cumulative product of float column (see `Column.cumulative`).
+        """
+        assert colname in self.columns, "Dataframe doesn't contain " + colname + " column."
+        return self._columns[colname].cumulative("prod", skipna)
+
+    @_traced
+    def rolling(self, colname, window: int, op: str = "mean", skipna=True) -> Column:
+        """
+        Statistics of float column over sliding window (see `Column.rolling`),
+        eg. `df.rolling("T", 30, "max")`.
+        """
+        assert colname in self.columns, "Dataframe doesn't contain " + colname + " column."
+        return self._columns[colname].rolling(window, op, skipna)
+    
+    _REDUCTIONS = ("min", "max", "sum", "mean", "range", "count")
+
+    @_traced
+    def reduce_rows(self, columns: Iterable[str], op: str = "mean") -> Column:
+        """
+        Reduces values of selected columns in every row, eg. range of daily temperatures
+        `df.reduce_rows(["X1.", "X2.", "X3."], "range")`. None values are skipped
+        (String columns are parsed, items which are not numbers like "NA" are skipped too),
+        rows without any value get None (or 0 for count). Columns are swept one at a time.
+        :param columns: names of reduced columns
+        :param op: "min", "max", "sum", "mean", "range" (max - min) or "count"
+        :return: new float column with one item for every row
+        """
+        names = list(columns)
+        for name in names:
+            assert name in self.columns, "DataFrame doesn't contain " + name + " column."
+        if op not in DataFrame._REDUCTIONS:
+            raise ValueError("Unsupported reduction " + str(op))
+
+        size = len(self)
+        rows = range(size)
+        counts = array("q", bytes(8 * size))
+        sums = array("d", bytes(8 * size))
+        lows = array("d", [inf]) * size
+        highs = array("d", [-inf]) * size
+        for name in names:
+            data, valid = self._columns[name]._floats()
+            counts = array("q", map(operator.add, counts, valid))
+            if op in ("sum", "mean"):
+                for row, value in compress(zip(rows, data), valid):
+                    sums[row] += value
+            if op in ("min", "range"):
+                for row, value in compress(zip(rows, data), valid):
+                    if value < lows[row]:
+                        lows[row] = value
+            if op in ("max", "range"):
+                for row, value in compress(zip(rows, data), valid):
+                    if value > highs[row]:
+                        highs[row] = value
+
+        if op == "count":
+            return Column._from_buffers(Type.Float, array("d", counts))
+        if op == "mean":
+            values = map(operator.truediv, sums, map(max, counts, repeat(1)))
+        elif op == "range":
+            values = map(operator.sub, highs, lows)
+        else:
+            values = {"sum": sums, "min": lows, "max": highs}[op]
+        return Column._from_buffers(
+            Type.Float, array("d", [value if count else 0.0 for value, count in zip(values, counts)]),
+            bytearray(map(bool, counts)))
+
+    @_traced
+    def unique(self, col_name: Union[str, List[str]]) -> 'DataFrame':
+        """
+        Create a new DataFrame only containing rows with the first occurence of a unique value in a selected column.
+        :param col_name: column selected for unique value search (or list of columns)
+        :return: new reduced dataframe  
+        """
+        names = [col_name] if isinstance(col_name, str) else list(col_name)
+        for name in names:
+            assert name in self.columns, "Dataframe does not contain " + name + " column."
+        
+        rows = self._first_occurrences(names)
+        return DataFrame._from_columns({name: column.permute(rows)
+                                        for name, column in self._columns.items()})
+
+    @_traced
+    def drop_duplicates(self, subset: Iterable[str] = None) -> 'DataFrame':
+        """
+        Create a new DataFrame without repeated rows (the first occurence is kept).
+        :param subset: columns which are compared (all columns by default)
+        :return: new reduced dataframe
+        """
+        return self.unique(list(self.columns) if subset is None else list(subset))
+
+    def _first_occurrences(self, names: List[str]) -> List[int]:
+        """
+        :return: indices of the first occurence of every (composite) value of columns
+        """
+        columns = [self._columns[name] for name in names]
+        if len(columns) == 1 and columns[0].categorical:
+            # first occurence of every code (the last slot is for code -1, i.e. None)
+            first = [-1] * (len(columns[0]._categories) + 1)
+            rows = []
+            for index, code in enumerate(columns[0]._data):
+                if first[code] < 0:
+                    first[code] = index
+                    rows.append(index)
+            return rows
+        
+        keys = columns[0] if len(columns) == 1 else zip(*columns)
+        first = {}
+        setdefault = first.setdefault
+        for index, key in enumerate(keys):
+            setdefault(key, index)
+        return list(first.values())
+
+    @_traced
+    def value_counts(self, col_name: str, dropna: bool = True) -> 'DataFrame':
+        """
+        Counts occurences of values in column.
+        :param col_name: name of column
+        :param dropna: None is not counted
+        :return: new dataframe with columns `col_name` (distinct values) and "count"
+                 ordered by count (descending)
+        """
+        assert col_name in self.columns, "Dataframe does not contain " + col_name + " column."
+        column = self._columns[col_name]
+        if column.categorical:
+            categories = column._categories + [None]
+            counts = Counter(column._data)
+            counts = {categories[code]: count for code, count in counts.items()}
+        else:
+            counts = Counter(column)
+        if dropna:
+            counts.pop(None, None)
+        items = sorted(counts.items(), key=operator.itemgetter(1), reverse=True)
+        return DataFrame._from_columns({
+            col_name: Column([value for value, _ in items], column.dtype, categorical=column.categorical),
+            "count": Column([count for _, count in items], Type.Float)})
+
+    def nunique(self, col_name: str, dropna: bool = True) -> int:
+        """
+        :param col_name: name of column
+        :param dropna: None is not counted
+        :return: number of distinct values in column
+        """
+        assert col_name in self.columns, "Dataframe does not contain " + col_name + " column."
+        column = self._columns[col_name]
+        values = set(column._data if column.categorical else column)
+        return len(values) - (dropna and (-1 if column.categorical else None) in values)
+
+    def approx_nunique(self, col_name: str, precision: int = 12) -> int:
+        """
+        Approximate number of distinct values (None excluded) computed by HyperLogLog
+        sketch in constant memory (relative error is about `1.04 / sqrt(2 ** precision)`).
+        :param col_name: name of column
+        :param precision: number of bits of hash used for indexing of registers
+        :return: estimated number of distinct values
+        """
+        assert col_name in self.columns, "Dataframe does not contain " + col_name + " column."
+        column = self._columns[col_name]
+        if column.categorical:
+            return self.nunique(col_name)
+        return HyperLogLog(precision).update(column).count()
+    
+    @_traced
+    def sample(self, sample_size:int, *, norepeat=False, weights: str = None,
+               random_state: Union[int, random.Random] = None) -> 'DataFrame':
+        """
+        Creates a new DataFrame containing randomly selected entries from the original DataFrame
+        :param sample_size: defines the number of randomly selected entries
+        :param norepeat: Optional. Selects whether the randomly sampled DataFrame can contain repeat entries. Defaults to False.
+        :param weights: Optional. Name of float column with weights of entries (None is weight 0).
+        :param random_state: Optional. Seed or instance of `random.Random` (global generator by default).
+        :return: new randomly sampled DataFrame
+        """
+        rng = _random_generator(random_state)
+        if weights is None:
+            if norepeat:
+                assert sample_size <= self._size, "Sample size exceeds the number of entries, use 'norepeat=False' for duplicate samples."
+                rows = rng.sample(range(self._size), sample_size)
+            else:
+                rows = rng.choices(range(self._size), k=sample_size)
+        else:
+            assert weights in self.columns, "DataFrame doesn't contain " + weights + " column."
+            column = self._columns[weights]
+            assert column.dtype == Type.Float, "Column of weights is not a float type."
+            weight_values = [value if valid and value > 0 else 0.0
+                             for value, valid in zip(column._data, column._valid)]
+            if norepeat:
+                # Efraimidis-Spirakis: k largest keys u ** (1 / weight)
+                positive = [index for index, weight in enumerate(weight_values) if weight > 0]
+                assert sample_size <= len(positive), "Sample size exceeds the number of entries with positive weight."
+                keys = {index: _open_uniform(rng) ** (1.0 / weight_values[index]) for index in positive}
+                rows = nlargest(sample_size, positive, key=keys.__getitem__)
+            else:
+                rows = rng.choices(range(self._size), weights=weight_values, k=sample_size)
+        
+        return DataFrame._from_columns({name: column.permute(rows)
+                                        for name, column in self._columns.items()})
+
+    @staticmethod
+    def sample_chunks(chunks: Iterable['DataFrame'], sample_size: int,
+                      random_state: Union[int, random.Random] = None) -> 'DataFrame':
+        """
+        Reservoir sampling (without replacement) over stream of chunks (eg. from
+        `DataFrame.iter_chunks`), only `sample_size` rows are kept in memory.
+        Rows which are skipped are not even read from chunks (Algorithm L).
+        :param chunks: dataframes with the same columns
+        :param sample_size: number of sampled rows (all rows if there are less rows)
+        :param random_state: seed or instance of `random.Random` (global generator by default)
+        :return: new randomly sampled DataFrame
+        """
+        rng = _random_generator(random_state)
+        reservoir, schema = [], None
+        position = 0 # index of the first row of chunk in stream
+        w = next_index = None
+        for chunk in chunks:
+            if schema is None:
+                schema = {name: column for name, column in chunk._columns.items()}
+            index = 0
+            while len(reservoir) < sample_size and index < len(chunk):
+                reservoir.append(chunk[index])
+                index += 1
+            if w is None and sample_size > 0 and len(reservoir) == sample_size:
+                w = exp(log(_open_uniform(rng)) / sample_size)
+                next_index = position + index + floor(log(_open_uniform(rng)) / log(1 - w))
+            if w is not None:
+                while next_index < position + len(chunk):
+                    reservoir[rng.randrange(sample_size)] = chunk[next_index - position]
+                    w *= exp(log(_open_uniform(rng)) / sample_size)
+                    next_index += floor(log(_open_uniform(rng)) / log(1 - w)) + 1
+            position += len(chunk)
+        
+        assert schema is not None, "There are no chunks"
+        return DataFrame._from_columns({
+            name: Column([row[i] for row in reservoir], column.dtype, categorical=column.categorical)
+            for i, (name, column) in enumerate(schema.items())})
+
+    @_traced
+    def select(self, *col_names: str) -> 'DataFrame':
+        """
+        Returns new dataframe containing only selected columns (in given order).
+        :param col_names: names of columns
+        :return: new dataframe
+        """
+        for name in col_names:
+            assert name in self.columns, "DataFrame doesn't contain " + name + " column."
+        return DataFrame({name: self._columns[name] for name in col_names})
+
+    @_traced
+    def rename(self, names: Dict[str, str]) -> 'DataFrame':
+        """
+        Returns new dataframe with renamed columns (data of columns are shared).
+        :param names: dictionary (old name -> new name), other columns keep their names
+        :return: new dataframe
+        """
+        for name in names:
+            assert name in self.columns, "DataFrame doesn't contain " + name + " column."
+        return DataFrame({names.get(name, name): column for name, column in self._columns.items()})
+
+    @_traced
+    def take(self, rows: Iterable[int]) -> 'DataFrame':
+        """
+        Returns new dataframe with rows at given positions (eg. found by index).
+        :param rows: row positions
+        :return: new dataframe
+        """
+        rows = list(rows)
+        return DataFrame._from_columns({name: column.permute(rows)
+                                        for name, column in self._columns.items()})
+
+    def create_index(self, col_name: Union[str, List[str]], kind: str = "hash") -> Index:
+        """
+        Creates secondary index on column(s), eg. `df.create_index(["rok", "mesic"])[(1961, 1)]`
+        returns positions of rows of January 1961. The index is maintained by
+        `append_row`, `append_rows`, `__delitem__` and `setvalue` (direct changes of
+        columns are not tracked). Existing index on the same columns is replaced.
+        :param col_name: name of key column or list of names (composite key)
+        :param kind: "hash" (equality lookups) or "sorted" (equality and range lookups)
+        :return: new index
+        """
+        names = [col_name] if isinstance(col_name, str) else list(col_name)
+        for name in names:
+            assert name in self.columns, "DataFrame doesn't contain " + name + " column."
+        columns = [self._columns[name] for name in names]
+        keys = columns[0] if len(columns) == 1 else zip(*columns)
+        index = Index(names, kind, keys)
+        self._indexes[tuple(names)] = index
+        return index
+
+    def get_index(self, col_name: Union[str, List[str]]) -> Union[Index, None]:
+        """
+        :param col_name: name of key column or list of names
+        :return: index created by `create_index` (None if there is no index on the columns)
+        """
+        names = [col_name] if isinstance(col_name, str) else list(col_name)
+        return self._indexes.get(tuple(names))
+
+    def drop_index(self, col_name: Union[str, List[str]]) -> None:
+        """
+        Removes index on column(s).
+        """
+        names = [col_name] if isinstance(col_name, str) else list(col_name)
+        self._indexes.pop(tuple(names), None)
+
+    def _key(self, names: List[str], row: int) -> Any:
+        """
+        :return: key of row in index on columns `names`
+        """
+        if len(names) == 1:
+            return self._columns[names[0]][row]
+        return tuple(self._columns[name][row] for name in names)
+
+    def _index_rows(self, start: int) -> None:
+        """
+        Adds rows appended from position `start` to all indexes.
+        """
+        for index in self._indexes.values():
+            for row in range(start, self._size):
+                index._insert(self._key(index.names, row), row)
+
+    def lazy(self) -> 'LazyFrame':
+        """
+        Returns lazy query over dataframe (operations are evaluated by `LazyFrame.collect`).
+        :return: lazy frame
+        """
+        return LazyFrame(self)
+       
+
+    @staticmethod
+    @_traced
+    def read_csv(path: Union[str, Path], **options) -> 'DataFrame':
+        """
+        Read dataframe by CSV reader (options are passed to `CSVReader`)
+        """
+        return CSVReader(path, **options).read()
+
+    @staticmethod
+    @_traced
+    def read_json(path: Union[str, Path]) -> 'DataFrame':
+        """
+        Read dataframe by JSON reader
+        """
+        return JSONReader(path).read()
+
+    @staticmethod
+    @_traced
+    def read_binary(path: Union[str, Path], mmap: bool = True) -> 'DataFrame':
+        """
+        Read dataframe by binary reader (file written by `to_binary`)
+        """
+        return BinaryReader(path, mmap=mmap).read()
+
+    @_traced
+    def to_binary(self, path: Union[str, Path]) -> None:
+        """
+        Writes dataframe to binary columnar file. The file contains header (JSON with
+        names and types of columns, tables of categories of string columns and
+        positions of buffers) followed by raw buffers: float64 values and validity
+        masks of float columns, int32 codes of (dictionary-encoded) string columns.
+        Plain string columns are encoded too and they are decoded when file is read.
+        :param path: path to file
+        """
+        columns, buffers = [], []
+        position = 0
+        for name, column in self._columns.items():
+            meta = {"name": name, "dtype": column.dtype.name}
+            if column.dtype == Type.Float:
+                parts = {"data": column._data, "valid": column._valid}
+            else:
+                meta["categorical"] = column.categorical
+                if not column.categorical:
+                    column = column.encode()
+                meta["categories"] = column._categories
+                parts = {"codes": column._data}
+            for key, buffer in parts.items():
+                buffer = memoryview(buffer).cast("B")
+                position += -position % 8 # buffers are aligned to 8 bytes
+                meta[key] = position
+                buffers.append((position, buffer))
+                position += len(buffer)
+            columns.append(meta)
+
+        header = dumps({"size": len(self), "byteorder": byteorder,
+                        "columns": columns}).encode("utf-8")
+        # columns can be views of memory-mapped `path` (see `read_binary`), so data
+        # are written to temporary file which replaces `path` at the end
+        path = Path(path)
+        fd, temporary = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        try:
+            with open(fd, "wb") as f:
+                f.write(BinaryReader.MAGIC)
+                f.write(len(header).to_bytes(8, "little"))
+                f.write(header)
+                start = f.tell() + (-f.tell() % 8)
+                for position, buffer in buffers:
+                    f.write(bytes(start + position - f.tell()))
+                    f.write(buffer)
+            # `mkstemp` creates file readable only by owner, the file gets mode of replaced
+            # file or mode of newly created file (0666 without bits of umask)
+            try:
+                mode = os.stat(path).st_mode & 0o7777
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                mode = 0o666 & ~umask
+            os.chmod(temporary, mode)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @staticmethod
+    def iter_chunks(path: Union[str, Path], chunksize: int, **options) -> Iterator['DataFrame']:
+        """
+        Reads dataframe from CSV file (suffix .csv) or JSON file by chunks.
+        (options are passed to `CSVReader`)
+        :param path: path to file
+        :param chunksize: maximal number of rows of chunk
+        :return: iterator over dataframes with at most `chunksize` rows
+        """
+        return Reader.for_path(path, **options).iter_chunks(chunksize)
+
+    @staticmethod
+    @_traced
+    def read_many(paths: Iterable[Union[str, Path]], workers: int = None, **options) -> 'DataFrame':
+        """
+        Reads CSV files (suffix .csv) or JSON files in pool of processes and
+        concatenates them (columns are allocated once). All files has to have the
+        same names and types of columns. (options are passed to `CSVReader`)
+        :param paths: paths to files
+        :param workers: number of processes (number of CPUs by default, 1 reads
+                        files sequentially in current process)
+        :return: new dataframe containing data from all files
+        """
+        paths = list(paths)
+        assert len(paths) > 0, "There are no files"
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        read = partial(_read_file, **options)
+        if workers == 1:
+            frames = [read(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                frames = list(executor.map(read, paths))
+        assert len(frames) == len(paths), "Some files were not read"
+
+        schema = [(name, column.dtype) for name, column in frames[0]._columns.items()]
+        for path, df in zip(paths[1:], frames[1:]):
+            if [(name, column.dtype) for name, column in df._columns.items()] != schema:
+                raise ValueError(f"Columns of {path} do not match columns of {paths[0]}")
+        return DataFrame.concat(frames)
+
+    @staticmethod
+    def stream_stats(chunks: Iterable['DataFrame']) -> Dict[str, ColumnStats]:
+        """
+        Folds statistics of float columns over chunks of data, eg.
+        `DataFrame.stream_stats(DataFrame.iter_chunks("pocasi.json", 10000))`.
+        :param chunks: dataframes with the same columns
+        :return: statistics of all float columns (name -> statistics)
+        """
+        stats = {}
+        for chunk in chunks:
+            for name, column in chunk._columns.items():
+                if column.dtype == Type.Float:
+                    stats.setdefault(name, ColumnStats()).update(column)
+        return stats
+
+
+class LazyFrame:
+    """
+    Lazy query over dataframe. Operations (`filter`, `sort`, `unique`, `extend`,
+    `select`, `head`) are only recorded into a plan which is evaluated by `collect`.
+
+    The plan is optimized when operations are recorded: consecutive filters are
+    fused and filters are pushed before sorts, projections and extends. Evaluation
+    works with row indices of the source dataframe, so only key columns are scanned
+    and only the needed columns (and rows) are materialized at the end.
+    """
+    def __init__(self, source: DataFrame, plan: Tuple = (), columns: Tuple[str] = None):
+        self._source = source
+        self._plan = plan
+        self._columns = tuple(source.columns) if columns is None else columns
+
+    @property
+    def columns(self) -> Iterable[str]:
+        """
+        :return: names of columns of result
+        """
+        return self._columns
+
+    def _check(self, col_name: str) -> None:
+        assert col_name in self._columns, "LazyFrame doesn't contain " + col_name + " column."
+
+    def _with(self, step: Tuple, columns: Tuple[str] = None) -> 'LazyFrame':
+        return LazyFrame(self._source, self._plan + (step,),
+                         self._columns if columns is None else columns)
+
+    def filter(self, col_name: str,
+               predicate: Callable[[Union[float, str]], bool]) -> 'LazyFrame':
+        """
+        Records filter (see `DataFrame.filter`, masks are not supported in lazy mode).
+        :param col_name: name of tested column
+        :param predicate: testing function
+        :return: new lazy frame
+        """
+        self._check(col_name)
+        plan = list(self._plan)
+        LazyFrame._push_filter(plan, [(col_name, predicate)])
+        return LazyFrame(self._source, tuple(plan), self._columns)
+
+    @staticmethod
+    def _push_filter(plan: List[Tuple], predicates: List[Tuple[str, Callable]]) -> None:
+        """
+        Appends filter to plan, the filter is moved before sorts, projections and
+        extends (to all extending frames) and fused with preceding filter.
+        """
+        if plan and plan[-1][0] in ("sort", "select"):
+            step = plan.pop()
+            LazyFrame._push_filter(plan, predicates)
+            plan.append(step)
+        elif plan and plan[-1][0] == "extend":
+            others = []
+            for other in plan.pop()[1]:
+                other_plan = list(other._plan)
+                LazyFrame._push_filter(other_plan, predicates)
+                others.append(LazyFrame(other._source, tuple(other_plan), other._columns))
+            LazyFrame._push_filter(plan, predicates)
+            plan.append(("extend", tuple(others)))
+        elif plan and plan[-1][0] == "filter":
+            plan[-1] = ("filter", plan[-1][1] + predicates)
+        else:
+            plan.append(("filter", predicates))
+
+    def sort(self, by: Union[str, List[str]] = None, ascending: Union[bool, List[bool]] = True,
+             na_position: str = "last", *, col_name: str = None) -> 'LazyFrame':
+        """
+        Records sort (see `DataFrame.sort`).
+        """
+        by = DataFrame._sort_keys(by, col_name)
+        by = (by,) if isinstance(by, str) else tuple(by)
+        for name in by:
+            self._check(name)
+        return self._with(("sort", by, ascending, na_position))
+
+    def unique(self, col_name: str) -> 'LazyFrame':
+        """
+        Records selection of first occurences of unique values (see `DataFrame.unique`).
+        """
+        self._check(col_name)
+        return self._with(("unique", col_name))
+
+    def extend(self, *donor_df: Union[DataFrame, 'LazyFrame']) -> 'LazyFrame':
+        """
+        Records extension by dataframes (or lazy frames) with identical column structure.
+        """
+        others = tuple(df if isinstance(df, LazyFrame) else df.lazy() for df in donor_df)
+        for other in others:
+            assert set(other.columns) == set(self._columns), "Input DataFrames do not match in structures"
+        return self._with(("extend", others))
+
+    def select(self, *col_names: str) -> 'LazyFrame':
+        """
+        Records projection to selected columns.
+        """
+        for name in col_names:
+            self._check(name)
+        return self._with(("select", col_names), col_names)
+
+    def head(self, n: int) -> 'LazyFrame':
+        """
+        Records selection of the first `n` rows.
+        """
+        return self._with(("head", n))
+
+    def explain(self) -> str:
+        """
+        :return: description of optimized plan
+        """
+        steps = []
+        for step in self._plan:
+            if step[0] == "filter":
+                steps.append("filter(" + ", ".join(name for name, _ in step[1]) + ")")
+            elif step[0] == "extend":
+                steps.append("extend(" + ", ".join("[" + other.explain() + "]" for other in step[1]) + ")")
+            elif step[0] in ("select", "sort"):
+                steps.append(step[0] + "(" + ", ".join(step[1]) + ")")
+            else:
+                steps.append(step[0] + "(" + ", ".join(map(str, step[1:])) + ")")
+        return " -> ".join(["scan"] + steps)
+
+    def __repr__(self) -> str:
+        return "LazyFrame(" + self.explain() + ")"
+
+    @_traced
+    def collect(self) -> DataFrame:
+        """
+        Evaluates plan.
+        :return: new dataframe
+        """
+        # columns needed after every step (result columns + keys of later steps)
+        needed = set(self._columns)
+        needs = []
+        for step in reversed(self._plan):
+            needs.append(set(needed))
+            if step[0] == "filter":
+                needed.update(name for name, _ in step[1])
+            elif step[0] == "sort":
+                needed.update(step[1])
+            elif step[0] == "unique":
+                needed.add(step[1])
+        needs.reverse()
 
+        frame, rows = self._source, None
+        for step, after in zip(self._plan, needs):
+            if step[0] == "filter":
+                for name, predicate in step[1]:
+                    column = frame._columns[name]
+                    if rows is None:
+                        rows = Mask(column._matches(predicate)).indices()
+                    else:
+                        rows = [index for index in rows if predicate(column[index])]
+            elif step[0] == "sort":
+                rows = frame._argsort(*step[1:], rows=rows)
+            elif step[0] == "unique":
+                column = frame._columns[step[1]]
+                seen = set()
+                selected = []
+                for index in range(len(frame)) if rows is None else rows:
+                    value = column[index]
+                    if value not in seen:
+                        seen.add(value)
+                        selected.append(index)
+                rows = selected
+            elif step[0] == "head":
+                rows = list(range(min(step[1], len(frame)))) if rows is None else rows[:step[1]]
+            elif step[0] == "extend":
+                names = [name for name in frame.columns if name in after]
+                current = LazyFrame._gather(frame, names, rows)
+                frame = current.extend(*(other.select(*names).collect() for other in step[1]))
+                rows = None
+        return LazyFrame._gather(frame, self._columns, rows)
 
-    def sort(self, col_name:str, ascending=True) -> 'DataFrame':
+    @staticmethod
+    def _gather(frame: DataFrame, names: Iterable[str], rows: Union[List[int], None]) -> DataFrame:
+        if rows is None:
+            return DataFrame({name: frame._columns[name] for name in names})
+        return DataFrame._from_columns({name: frame._columns[name].permute(rows) for name in names})
+
+
+class GroupBy:
+    """
+    Grouping of rows of dataframe by values of key columns (see `DataFrame.groupby`).
+    Every row gets integer code of its group (groups are ordered by their first
+    occurence, rows with None in any key column are excluded). Aggregates of all
+    groups are computed in one pass over codes and the data column.
+    """
+    AGGREGATES = ("count", "sum", "min", "max", "mean")
+    _BUILTINS = {sum: "sum", min: "min", max: "max", len: "count"}
+
+    def __init__(self, df: DataFrame, keys: List[str]):
+        assert len(keys) > 0, "Grouping requires at least one key column"
+        for key in keys:
+            assert key in df.columns, "DataFrame doesn't contain " + key + " column."
+        self._df = df
+        self._keys = keys
+        self._groups, self._codes = self._encode()
+
+    def _encode(self) -> Tuple[Dict[Any, int], array]:
         """
-        Sort dataframe by column with `col_name` ascending or descending.
-        :param col_name: name of key column
-        :param ascending: direction of sorting
-        :return: new dataframe
+        :return: dictionary (key -> code of group) and codes of groups of rows (-1 for excluded rows)
         """
-        
-        ret_df = self._skeleton()
-        
-        for row in sorted(iter(self), key = lambda col: col[list(self.columns).index(col_name)], reverse = not ascending):
-            ret_df.append_row(row)
-        
-        return ret_df
+        columns = [self._df._columns[key] for key in self._keys]
+        groups = {}
+        if len(columns) == 1 and columns[0].categorical:
+            # groups are numbered directly by codes of categories
+            column = columns[0]
+            ids = [-2] * len(column._categories) + [-1]
+            for code in column._data:
+                if ids[code] == -2:
+                    ids[code] = len(groups)
+                    groups[column._categories[code]] = ids[code]
+            return groups, array("i", map(ids.__getitem__, column._data))
 
-    def describe(self) -> str:
+        setdefault = groups.setdefault
+        if len(columns) == 1:
+            codes = array("i", [-1 if key is None else setdefault(key, len(groups))
+                                for key in columns[0]])
+        else:
+            codes = array("i", [-1 if None in key else setdefault(key, len(groups))
+                                for key in zip(*columns)])
+        return groups, codes
+
+    def __len__(self) -> int:
         """
-        similar to pandas but only with min, max and avg statistics for floats and count"
-        :return: string with formatted decription
+        :return: number of groups
         """
-        ...
+        return len(self._groups)
 
-    def inner_join(self, other: 'DataFrame', self_key_column: str,
-                   other_key_column: str) -> 'DataFrame':
+    def _accumulate(self, column: Column) -> Tuple[array, array, array, array]:
         """
-            Inner join between self and other dataframe with join predicate
-            `self.key_column == other.key_column`.
+        One pass over codes and data column.
+        :return: count, sum, min and max of non None items for all groups
+                 (only counts for String columns)
+        """
+        size = len(self._groups)
+        counts = array("q", bytes(8 * size))
+        if column.dtype != Type.Float:
+            for group, value in zip(self._codes, column):
+                if group >= 0 and value is not None:
+                    counts[group] += 1
+            return counts, None, None, None
 
-            Possible collision of column identifiers is resolved by prefixing `_other` to
-            columns from `other` data table.
+        sums = array("d", bytes(8 * size))
+        mins = array("d", [float("inf")]) * size
+        maxs = array("d", [float("-inf")]) * size
+        for group, value, valid in zip(self._codes, column._data, column._valid):
+            if group < 0 or not valid:
+                continue
+            counts[group] += 1
+            sums[group] += value
+            if value < mins[group]:
+                mins[group] = value
+            if value > maxs[group]:
+                maxs[group] = value
+        return counts, sums, mins, maxs
+
+    @staticmethod
+    def _aggregates(spec: Dict[str, Iterable[Union[str, Callable]]]) -> List[Tuple[str, str]]:
         """
-        ...
-        
-    def extend(self, *donor_df: 'DataFrame') -> 'DataFrame':
+        Normalizes specification of aggregates to list of pairs (column name, aggregate).
         """
-        Joins data from DataFrames with identical column structure into a new DataFrame
-        :return: new dataframe containing data from all input dataframes
+        pairs = []
+        for col_name, aggregates in spec.items():
+            if isinstance(aggregates, str) or callable(aggregates):
+                aggregates = [aggregates]
+            for aggregate in aggregates:
+                name = GroupBy._BUILTINS.get(aggregate, aggregate)
+                if name not in GroupBy.AGGREGATES:
+                    raise ValueError("Unsupported aggregate " + str(aggregate))
+                pairs.append((col_name, name))
+        return pairs
+
+    @_traced
+    def agg(self, spec: Dict[str, Iterable[Union[str, Callable]]]) -> DataFrame:
         """
-        for df in donor_df:
-            assert df.columns == self.columns, "Input DataFrames do not match in structures"
-            
-        ret_df = self._skeleton()
-        
-        for df in (self,) + donor_df:
-            for row in df:
-                ret_df.append_row(row)
-            
-        return ret_df
-        
+        Aggregates data columns for every group, eg. `{"X1.": ["sum", "mean", max]}`
+        (supported aggregates are count, sum, min, max and mean, builtins `sum`,
+        `min`, `max` and `len` can be used too). None values are skipped.
+        :param spec: dictionary (name of column -> list of aggregates)
+        :return: new dataframe with key columns and columns `aggregate(column)`
+        """
+        pairs = GroupBy._aggregates(spec)
+        accumulators = {}
+        for col_name, aggregate in pairs:
+            assert col_name in self._df.columns, "DataFrame doesn't contain " + col_name + " column."
+            column = self._df._columns[col_name]
+            assert aggregate == "count" or column.dtype == Type.Float, \
+                "Data column " + col_name + " is not a float type."
+            if col_name not in accumulators:
+                accumulators[col_name] = self._accumulate(column)
+        return GroupBy._result(self._df, self._keys, list(self._groups), accumulators, pairs)
 
-    def setvalue(self, col_name: str, row_index: int, value: Any) -> None:
+    @staticmethod
+    def _result(df: DataFrame, keys: List[str], groups: List, accumulators: Dict[str, Tuple],
+                pairs: List[Tuple[str, str]]) -> DataFrame:
         """
-        Set new value in dataframe.
-        :param col_name:  name of culumns
-        :param row_index: index of row
-        :param value:  new value (value is cast to type of column)
-        :return:
+        Builds dataframe from keys of groups and accumulated values
+        (key columns of `df` are templates of key columns of result).
         """
-        col = self._columns[col_name]
-        col[row_index] = col._cast(value)
-    
-    def sum_by(self, category_column, data_columns: Iterable):
-        
-        #input check
-        assert category_column in self.columns, "DataFrame doesn't contain " + category_column + " column."
-        
-        for key in data_columns:
-            assert key in data_columns, "DataFrame doesn't contain " + key + " column."
-            assert self._columns[key].dtype == Type.Float, "Data column " + key + " is not a float type."
-        
-        
-        #produce a new category column with unique values only, None excluded
-        
-        
-        squished_category_column = Column(list(set(self._columns[category_column]._data)),self._columns[category_column].dtype)
-        
-        #set up a return DataFrame
-        ret_df = DataFrame({"Cat(" + category_column + ")": squished_category_column})
-        
-        #sum up the totals of categorical values in data columns + append the values as new columns        
-        cat_index = list(self.columns).index(category_column)
-        
-        for dc in data_columns:
-            
-            dc_index = list(self.columns).index(dc)
-            dc_dict = {}
-            
-            for row in self:
-                
-                if row[cat_index] is None:
-                    continue
-                
-                if row[cat_index] in dc_dict:
-                    if row[dc_index] is not None:
-                        try:
-                            dc_dict[row[cat_index]] += row[dc_index]
-                        except TypeError:
-                            continue
+        columns = {}
+        for position, key in enumerate(keys):
+            template = df._columns[key]
+            values = groups if len(keys) == 1 else [group[position] for group in groups]
+            columns[key] = Column(values, template.dtype, categorical=template.categorical)
+
+        for col_name, aggregate in pairs:
+            counts, sums, mins, maxs = accumulators[col_name]
+            if aggregate == "count":
+                values = counts
+            else:
+                values = {"sum": sums, "min": mins, "max": maxs}.get(aggregate)
+                if aggregate == "mean":
+                    values = [total / count if count else None for total, count in zip(sums, counts)]
                 else:
-                    dc_dict[row[cat_index]] = row[dc_index]
-            
-            ret_df.append_column(dc, Column(list(dc_dict.values()), Type.Float))
-               
-        return ret_df
-    
-    
-            
-    def cummin(self, colname, skipna=True):
-        
-        #input check
-        assert colname in self.columns, "Dataframe doesn't contain " + colname + " column."
-        
-        column = self._columns[colname]
-        
-        ret_col = Column([], column.dtype)
-        min_current = column[0]
-        
-        if skipna:
-            for val in column:
-                
-                if min_current is None:
-                    min_current = val
-                
-                if val is None:
-                    ret_col.append(min_current)
-                    continue
-                
-                if val < min_current:
-                    min_current = val
-                ret_col.append(min_current)
-                
-            return ret_col
-        
-        index = 0
-        for val in column:
-            if val is None:
-                for i in range(index,column.__len__()):
-                    ret_col.append(None)
-                return ret_col
-            if val < min_current:
-                min_current = val
-            ret_col.append(min_current)
-            index += 1
-                    
-        return ret_col       
-    
-    def unique(self, col_name:str) -> 'DataFrame':
+                    values = [value if count else None for value, count in zip(values, counts)]
+            columns[aggregate + "(" + col_name + ")"] = Column(values, Type.Float)
+        return DataFrame._from_columns(columns)
+
+
+class _SharedFrame:
+    """
+    Columns of dataframe copied into blocks of shared memory (one block per buffer),
+    `spec` describes the blocks so that worker processes can attach them. Plain
+    String columns are dictionary-encoded, so only codes are shared.
+    """
+    def __init__(self, df: DataFrame, names: Iterable[str]):
+        self.blocks = []
+        self.spec = {}
+        try:
+            for name in names:
+                column = df._columns[name]
+                if column.dtype == Type.Float:
+                    buffers = [self._share(column._data, "d"), self._share(column._valid, "B")]
+                else:
+                    column = column.encode()
+                    buffers = [self._share(column._data, "i")]
+                self.spec[name] = (column.dtype, buffers, column._categories)
+        except BaseException:
+            self.close()
+            raise
+
+    def _share(self, buffer: Union[array, bytearray, memoryview], fmt: str) -> Tuple[str, str]:
+        data = memoryview(buffer).cast("B")
+        block = SharedMemory(create=True, size=max(len(data), 1))
+        self.blocks.append(block)
+        block.buf[:len(data)] = data
+        return block.name, fmt
+
+    def close(self) -> None:
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def _attach(spec: Dict[str, Tuple], start: int, stop: int,
+            blocks: List[SharedMemory]) -> DataFrame:
+    """
+    Dataframe of rows `start:stop` of shared columns (columns are views of shared memory).
+    """
+    columns = {}
+    for name, (dtype, buffers, categories) in spec.items():
+        views = []
+        for block_name, fmt in buffers:
+            block = SharedMemory(block_name)
+            blocks.append(block)
+            views.append(block.buf.cast(fmt)[start:stop])
+        columns[name] = Column._from_buffers(dtype, views[0], views[1] if len(views) > 1 else None,
+                                             categories)
+    return DataFrame._from_columns(columns)
+
+
+def _run_partition(function: Callable, spec: Dict[str, Tuple], start: int, stop: int, *args) -> Any:
+    """
+    Runs `function(partition, start, *args)` in worker process.
+    """
+    blocks = []
+    try:
+        return function(_attach(spec, start, stop, blocks), start, *args)
+    finally:
+        # views of shared memory are released together with the partition
+        for block in blocks:
+            try:
+                block.close()
+            except BufferError:
+                # result still refers to shared buffer, the block is closed by its finalizer
+                pass
+
+
+def _partition_filter(frame: DataFrame, start: int, col_name: str,
+                      predicate: Callable[[Union[float, str]], bool]) -> List[int]:
+    return [start + row for row in Mask(frame._columns[col_name]._matches(predicate)).indices()]
+
+
+def _partition_aggregates(frame: DataFrame, start: int, keys: List[str],
+                          names: List[str]) -> Tuple[List, Dict[str, Tuple]]:
+    grouping = GroupBy(frame, keys)
+    return list(grouping._groups), {name: grouping._accumulate(frame._columns[name])
+                                    for name in names}
+
+
+def _partition_stats(frame: DataFrame, start: int) -> Dict[str, ColumnStats]:
+    return DataFrame.stream_stats([frame])
+
+
+def _partition_apply(frame: DataFrame, start: int, function: Callable[[DataFrame], Any]) -> Any:
+    return function(frame)
+
+
+class ParallelExecutor:
+    """
+    Opt-in parallel execution of operations over row partitions of dataframe in pool
+    of processes, eg.
+    `with ParallelExecutor(workers=8) as executor: executor.sum_by(df, "Zanr", ["Cena"])`.
+
+    Needed columns are copied once into shared memory and every worker attaches
+    the buffers of its partition without copying or pickling them. Partial
+    results (row indices, aggregates of groups, statistics) are merged in the
+    order of partitions, so rows and groups are the same as of sequential
+    operations. Float aggregates (sums, means, statistics of `describe`) can
+    differ in the last bits, because partial results are added in different order.
+    Predicates and functions are sent to workers, so they have to be picklable
+    (functions defined at module level, not lambdas).
+    """
+    def __init__(self, workers: int = None, partitions: int = None):
         """
-        Create a new DataFrame only containing rows with the first occurence of a unique value in a selected column.
-        :param col_name: column selected for unique value search
-        :return: new reduced dataframe  
+        :param workers: number of processes (number of CPUs by default)
+        :param partitions: number of row partitions (number of workers by default)
         """
-        
-        assert col_name in self.columns, "Dataframe does not contain " + col_name + " column."
-        
-        ret_df = self._skeleton()
-        
-        unique_values = []
-        index = list(self.columns).index(col_name)
-        
-        for row in self:
-            if row[index] not in unique_values:
-                unique_values.append(row[index])
-                ret_df.append_row(row)
-            
-        return ret_df 
-    
-    def sample(self, sample_size:int, *, norepeat=False) -> 'DataFrame':
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions = partitions or self.workers
+        assert self.partitions > 0, "Number of partitions has to be positive"
+        self._executor = None
+
+    def __enter__(self) -> 'ParallelExecutor':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
         """
-        Creates a new DataFrame containing randomly selected entries from the original DataFrame
-        :param sample_size: defines the number of randomly selected entries
-        :param norepeat: Optional. Selects whether the randomly sampled DataFrame can contain repeat entries. Defaults to False.
-        :return: new randomly sampled DataFrame
+        Stops worker processes (they are started by first operation).
         """
-        if norepeat:
-            assert sample_size < self._size, "Sample size exceeds the number of entries, use 'norepeat=False' for duplicate samples."
-            ret_df = self._skeleton()
-            repeats = []
-            while sample_size > 0:
-                randindex = random.randrange(self._size)
-                if randindex not in repeats:
-                    repeats.append(randindex)
-                    ret_df.append_row(self[randindex])
-                    sample_size -= 1
-            
-            return ret_df
-        
-        ret_df = self._skeleton()
-        
-        for _ in range(sample_size):
-            ret_df.append_row(self[random.randrange(self._size)])
-            
-        return ret_df
-       
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
-    @staticmethod
-    def read_csv(path: Union[str, Path]) -> 'DataFrame':
+    def _bounds(self, size: int) -> List[Tuple[int, int]]:
+        count = min(self.partitions, size)
+        return [(size * part // count, size * (part + 1) // count) for part in range(count)]
+
+    def _map(self, df: DataFrame, names: Iterable[str], function: Callable, *args) -> List[Any]:
+        """
+        Runs `function(partition, start, *args)` for all partitions of columns `names`.
+        :return: results in order of partitions
+        """
+        bounds = self._bounds(len(df))
+        if not bounds:
+            return []
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        shared = _SharedFrame(df, names)
+        try:
+            futures = [self._executor.submit(_run_partition, function, shared.spec, start, stop, *args)
+                       for start, stop in bounds]
+            return [future.result() for future in futures]
+        finally:
+            shared.close()
+
+    @_traced
+    def map_partitions(self, df: DataFrame, function: Callable[[DataFrame], Any],
+                       columns: Iterable[str] = None) -> List[Any]:
+        """
+        Applies function to partitions of dataframe. Columns of partitions are views
+        of shared memory, so the result must not refer to them (eg. return lists
+        or copied columns).
+        :param df: dataframe
+        :param function: picklable function of dataframe
+        :param columns: names of columns needed by function (all columns by default)
+        :return: results for all partitions (in order of rows)
+        """
+        columns = df.columns if columns is None else list(columns)
+        for col_name in columns:
+            assert col_name in df.columns, "DataFrame doesn't contain " + col_name + " column."
+        return self._map(df, columns, _partition_apply, function)
+
+    @_traced
+    def filter(self, df: DataFrame, col_name: str,
+               predicate: Callable[[Union[float, str]], bool]) -> DataFrame:
+        """
+        Parallel `DataFrame.filter`, only the tested column is shared with workers,
+        which return indices of accepted rows. Rows are gathered once at the end.
+        :param df: filtered dataframe
+        :param col_name: name of tested column
+        :param predicate: picklable testing function
+        :return: new dataframe
+        """
+        assert col_name in df.columns, "DataFrame doesn't contain " + col_name + " column."
+        rows = list(chain.from_iterable(self._map(df, [col_name], _partition_filter,
+                                                  col_name, predicate)))
+        return DataFrame._from_columns({name: column.permute(rows)
+                                        for name, column in df._columns.items()})
+
+    @_traced
+    def agg(self, df: DataFrame, keys: Union[str, List[str]],
+            spec: Dict[str, Iterable[Union[str, Callable]]]) -> DataFrame:
         """
-        Read dataframe by CSV reader
+        Parallel `df.groupby(keys).agg(spec)`. Every worker accumulates counts, sums,
+        minimums and maximums of groups of its partition, groups are merged by keys.
+        :param df: grouped dataframe
+        :param keys: name of key column or list of names
+        :param spec: dictionary (name of column -> list of aggregates)
+        :return: new dataframe with key columns and columns `aggregate(column)`
         """
-        return CSVReader(path).read()
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        for key in keys:
+            assert key in df.columns, "DataFrame doesn't contain " + key + " column."
+        pairs = GroupBy._aggregates(spec)
+        names = []
+        for col_name, aggregate in pairs:
+            assert col_name in df.columns, "DataFrame doesn't contain " + col_name + " column."
+            assert aggregate == "count" or df._columns[col_name].dtype == Type.Float, \
+                "Data column " + col_name + " is not a float type."
+            if col_name not in names:
+                names.append(col_name)
+
+        partials = self._map(df, list(dict.fromkeys(keys + names)), _partition_aggregates,
+                             keys, names)
+        groups, accumulators = ParallelExecutor._merge_aggregates(partials, names)
+        return GroupBy._result(df, keys, groups, accumulators, pairs)
 
     @staticmethod
-    def read_json(path: Union[str, Path]) -> 'DataFrame':
+    def _merge_aggregates(partials: List[Tuple[List, Dict[str, Tuple]]],
+                          names: List[str]) -> Tuple[List, Dict[str, Tuple]]:
         """
-        Read dataframe by JSON reader
+        Merges accumulators of partitions (groups keep order of first occurence).
         """
-        return JSONReader(path).read()
+        groups = {}
+        merged = {name: (array("q"), array("d"), array("d"), array("d")) for name in names}
+        for keys, accumulators in partials:
+            ids = [groups.setdefault(key, len(groups)) for key in keys]
+            for name, (counts, sums, mins, maxs) in accumulators.items():
+                total_counts, total_sums, total_mins, total_maxs = merged[name]
+                missing = len(groups) - len(total_counts)
+                total_counts.extend(repeat(0, missing))
+                if sums is None:
+                    for group, count in zip(ids, counts):
+                        total_counts[group] += count
+                    continue
+                total_sums.extend(repeat(0.0, missing))
+                total_mins.extend(repeat(inf, missing))
+                total_maxs.extend(repeat(-inf, missing))
+                for group, count, total, low, high in zip(ids, counts, sums, mins, maxs):
+                    total_counts[group] += count
+                    total_sums[group] += total
+                    if low < total_mins[group]:
+                        total_mins[group] = low
+                    if high > total_maxs[group]:
+                        total_maxs[group] = high
+        return list(groups), merged
+
+    @_traced
+    def sum_by(self, df: DataFrame, category_column: str, data_columns: Iterable[str]) -> DataFrame:
+        """
+        Parallel `DataFrame.sum_by`.
+        """
+        data_columns = list(data_columns)
+        for key in data_columns:
+            assert key in df.columns, "DataFrame doesn't contain " + key + " column."
+            assert df._columns[key].dtype == Type.Float, "Data column " + key + " is not a float type."
+        totals = self.agg(df, category_column, {dc: ["sum"] for dc in data_columns})
+
+        columns = {"Cat(" + category_column + ")": totals._columns[category_column]}
+        for dc in data_columns:
+            columns[dc] = totals._columns["sum(" + dc + ")"]
+        return DataFrame._from_columns(columns)
+
+    @_traced
+    def describe(self, df: DataFrame,
+                 percentiles: Iterable[float] = (0.25, 0.5, 0.75)) -> DataFrame:
+        """
+        Parallel `DataFrame.describe`, statistics of partitions are merged.
+        :param df: described dataframe
+        :param percentiles: computed percentiles (numbers between 0 and 1)
+        :return: new dataframe
+        """
+        names = [name for name, column in df._columns.items() if column.dtype == Type.Float]
+        stats = {name: ColumnStats() for name in names}
+        for partial_stats in self._map(df, names, _partition_stats):
+            for name, column_stats in partial_stats.items():
+                stats[name].merge(column_stats)
+        return DataFrame.describe_stats(stats, percentiles)
 
 
 class Reader(ABC):
@@ -496,14 +3043,129 @@ class Reader(ABC):
     def read(self) -> DataFrame:
         raise NotImplemented("Abstract method")
 
+    @staticmethod
+    def for_path(path: Union[Path, str], **options) -> 'Reader':
+        """
+        :return: CSV reader for files with suffix .csv (options are passed to it),
+                 JSON reader otherwise
+        """
+        return CSVReader(path, **options) if Path(path).suffix.lower() == ".csv" else JSONReader(path)
+
+    def iter_chunks(self, chunksize: int) -> Iterator[DataFrame]:
+        """
+        Reads dataframe by chunks (readers which can not stream data read whole
+        dataframe at once and split it).
+        :param chunksize: maximal number of rows of chunk
+        :return: iterator over dataframes with at most `chunksize` rows
+        """
+        assert chunksize > 0, "Chunk size has to be positive"
+        df = self.read()
+        for start in range(0, len(df), chunksize):
+            rows = range(start, min(start + chunksize, len(df)))
+            yield DataFrame._from_columns({name: column.permute(rows)
+                                           for name, column in df._columns.items()})
+
+
+def _read_file(path: Union[Path, str], **options) -> DataFrame:
+    # reads one file in worker process of `DataFrame.read_many`
+    return Reader.for_path(path, **options).read()
+
+
+class _JSONStream:
+    """
+    Incremental parser of JSON file, values are decoded from a buffer which is refilled
+    by blocks of file. Stream tracks byte offsets, so more streams can read different
+    parts of one file (every stream seeks to its own position before reading).
+    """
+    _decoder = JSONDecoder()
+    # characters which can follow complete value
+    _DELIMITERS = frozenset(",:]} \t\r\n")
+
+    def __init__(self, f, offset: int = 0, block_size: int = 1 << 16):
+        self._file = f
+        self._file_offset = offset # position of next read in file
+        self._offset = offset # byte offset of start of buffer
+        self._block_size = block_size
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """
+        Reads next block of file (consumed part of buffer is dropped).
+        :return: False at the end of file
+        """
+        if self._eof:
+            return False
+        self._offset += len(self._buffer[:self._pos].encode("utf-8"))
+        self._file.seek(self._file_offset)
+        block = self._file.read(self._block_size)
+        self._file_offset += len(block)
+        self._eof = not block
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(block, final=self._eof)
+        self._pos = 0
+        return True
+
+    def tell(self) -> int:
+        """
+        :return: byte offset of current position
+        """
+        return self._offset + len(self._buffer[:self._pos].encode("utf-8"))
+
+    def peek(self) -> str:
+        """
+        :return: next character which is not whitespace (empty string at the end of file)
+        """
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos].isspace():
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def expect(self, chars: str) -> str:
+        """
+        Reads next character which is not whitespace, it has to be one of `chars`.
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON file: expected one of '{chars}' at byte {self.tell()}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """
+        :return: next JSON value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _JSONStream._decoder.raw_decode(self._buffer, self._pos)
+            except JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if self._buffer[end:end + 1] not in _JSONStream._DELIMITERS and self._fill():
+                continue # value (eg. number split as `7.` + `5`) can continue in next block
+            self._pos = end
+            return value
+
 
 class JSONReader(Reader):
     """
-    Factory class for creation of dataframe by CSV file. CSV file must contain
-    header line with names of columns.
-    The type of columns should be inferred from types of their values (columns which
-    contains only value has to be floats columns otherwise string columns),
+    Factory class for creation of dataframe by JSON file. JSON file must contain
+    one object with attributes which array values represents columns.
+    The type of columns are inferred from types of their values (columns which
+    contains only value is floats columns otherwise string columns),
     """
+    def __init__(self, path: Union[Path, str], *, block_size: int = 1 << 16):
+        """
+        :param path: path to file
+        :param block_size: size of blocks read by streams of `iter_chunks` (bytes)
+        """
+        super().__init__(path)
+        self.block_size = block_size
+
     def read(self) -> DataFrame:
         with open(self.path, "rt") as f:
             json = load(f)
@@ -514,21 +3176,318 @@ class JSONReader(Reader):
             columns[cname] = Column(json[cname], dtype)
         return DataFrame(columns)
 
+    def _scan(self, stream: _JSONStream) -> List[Tuple[str, int, Type, int]]:
+        """
+        First pass over file (values are parsed but not stored).
+        :return: name, byte offset of array, type and length for all columns
+        """
+        columns = []
+        stream.expect("{")
+        if stream.peek() == "}":
+            return columns
+        while True:
+            name = stream.value()
+            stream.expect(":")
+            stream.peek()
+            offset = stream.tell()
+            stream.expect("[")
+            is_float, length = True, 0
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    value = stream.value()
+                    length += 1
+                    is_float = is_float and (value is None or isinstance(value, Real))
+                    if stream.expect(",]") == "]":
+                        break
+            columns.append((name, offset, Type.Float if is_float else Type.String, length))
+            if stream.expect(",}") == "}":
+                return columns
+
+    def iter_chunks(self, chunksize: int) -> Iterator[DataFrame]:
+        """
+        Reads dataframe by chunks in constant memory. The first pass over the file
+        finds positions and types of columns, the second pass reads all columns
+        in parallel (every column has its own stream).
+        :param chunksize: maximal number of rows of chunk
+        :return: iterator over dataframes with at most `chunksize` rows
+        """
+        assert chunksize > 0, "Chunk size has to be positive"
+        with open(self.path, "rb") as f:
+            columns = self._scan(_JSONStream(f, block_size=self.block_size))
+            assert len(columns) > 0, "Dataframe without columns is not supported"
+            size = common(length for _, _, _, length in columns)
+            streams = [_JSONStream(f, offset, self.block_size) for _, offset, _, _ in columns]
+            for stream in streams:
+                stream.expect("[")
+
+            for start in range(0, size, chunksize):
+                count = min(chunksize, size - start)
+                chunk = {}
+                for (name, _, dtype, _), stream in zip(columns, streams):
+                    values = []
+                    for i in range(count):
+                        if start or i:
+                            stream.expect(",")
+                        values.append(stream.value())
+                    chunk[name] = Column(values, dtype)
+                yield DataFrame._from_columns(chunk)
+
+
+class BinaryReader(Reader):
+    """
+    Factory class for creation of dataframe by binary columnar file (see
+    `DataFrame.to_binary`). If `mmap` is True, the file is memory-mapped and buffers
+    of columns are served directly from the map without copying (they are copied
+    only before the first modification of column).
+    """
+    MAGIC = b"MGTHRN01"
+
+    def __init__(self, path: Union[Path, str], *, mmap: bool = True):
+        super().__init__(path)
+        self.mmap = mmap
+
+    def read(self) -> DataFrame:
+        with open(self.path, "rb") as f:
+            if self.mmap:
+                content = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                content = memoryview(f.read())
+        if content[:len(BinaryReader.MAGIC)] != BinaryReader.MAGIC:
+            raise ValueError(str(self.path) + " is not a megatherion binary file")
+        position = len(BinaryReader.MAGIC) + 8
+        length = int.from_bytes(content[len(BinaryReader.MAGIC):position], "little")
+        header = loads(bytes(content[position:position + length]).decode("utf-8"))
+        position += length
+        start = position + (-position % 8)
+        size = header["size"]
+        # buffers in foreign byte order has to be copied and swapped
+        native = self.mmap and header["byteorder"] == byteorder
+
+        def buffer(offset: int, typecode: str) -> Union[memoryview, array, bytearray]:
+            raw = content[start + offset:start + offset + size * array(typecode).itemsize]
+            if native:
+                return raw.cast(typecode) if typecode != "B" else raw
+            if typecode == "B":
+                return bytearray(raw)
+            data = array(typecode)
+            data.frombytes(raw)
+            if header["byteorder"] != byteorder:
+                data.byteswap()
+            return data
+
+        columns = {}
+        for meta in header["columns"]:
+            if meta["dtype"] == Type.Float.name:
+                columns[meta["name"]] = Column._from_buffers(Type.Float, buffer(meta["data"], "d"),
+                                                             buffer(meta["valid"], "B"))
+            elif meta.get("categorical", True): # files without flag have only categorical columns
+                columns[meta["name"]] = Column._from_buffers(Type.String, buffer(meta["codes"], "i"),
+                                                             categories=meta["categories"])
+            else:
+                table = meta["categories"] + [None] # code -1 is None
+                columns[meta["name"]] = Column._from_buffers(
+                    Type.String, list(map(table.__getitem__, buffer(meta["codes"], "i"))))
+        return DataFrame._from_columns(columns)
+
 
 class CSVReader(Reader):
     """
-    Factory class for creation of dataframe by JSON file. JSON file must contain
-    one object with attributes which array values represents columns.
-    The type of columns are inferred from types of their values (columns which
-    contains only value is floats columns otherwise string columns),
+    Factory class for creation of dataframe by CSV file. CSV file must contain
+    header line with names of columns (unless `names` are given).
+    The type of columns are inferred from the first `sample_size` rows (columns which
+    contains only numbers or missing values are float columns otherwise string columns).
+    Values from `na_values` are read as None.
+
+    File is read by large blocks of rows which are transposed and parsed directly
+    into column buffers. If a value which is not a number is found later in an
+    inferred float column, the file is read again with string type of the column
+    (ValueError is raised for columns which type is given by `dtypes`).
     """
+    def __init__(self, path: Union[Path, str], *, names: List[str] = None,
+                 dtypes: Dict[str, Type] = None, usecols: Iterable[Union[str, int]] = None,
+                 nrows: int = None, sample_size: int = 1000, na_values: Iterable[str] = ("", "NA"),
+                 categorical: Iterable[str] = (), dialect: str = "excel", delimiter: str = None,
+                 block_rows: int = 65536):
+        """
+        :param path: path to CSV file
+        :param names: names of columns (file has no header line)
+        :param dtypes: explicit types of columns (name -> type), types of other columns are inferred
+        :param usecols: names (or positions) of columns which are read (all columns by default)
+        :param nrows: maximal number of rows which are read
+        :param sample_size: number of rows used for inference of types
+        :param na_values: strings which represents None
+        :param categorical: names of String columns which are dictionary-encoded
+        :param dialect: dialect of module `csv`
+        :param delimiter: delimiter of values (overrides delimiter of dialect)
+        :param block_rows: number of rows parsed at once
+        """
+        super().__init__(path)
+        self.names = names
+        self.dtypes = dtypes or {}
+        self.usecols = usecols
+        self.nrows = nrows
+        self.sample_size = sample_size
+        self.na_values = frozenset(na_values)
+        self.categorical = set(categorical)
+        self.dialect = dialect
+        self.delimiter = delimiter
+        self.block_rows = block_rows
+
+    def _open(self):
+        return open(self.path, "rt", newline="", buffering=1 << 20)
+
+    def _rows(self, f) -> Tuple[List[str], List[int], Iterator[List[str]]]:
+        """
+        :return: names of read columns, their positions in rows and iterator over rows
+        """
+        options = {} if self.delimiter is None else {"delimiter": self.delimiter}
+        rows = csv.reader(f, self.dialect, **options)
+        header = list(self.names) if self.names is not None else next(rows, None)
+        if header is None:
+            raise ValueError(f"{self.path} has no header line")
+        rows = filter(None, rows) # skip empty lines
+        if self.nrows is not None:
+            rows = islice(rows, self.nrows)
+
+        if self.usecols is None:
+            positions = list(range(len(header)))
+        else:
+            positions = [col if isinstance(col, int) else header.index(col) for col in self.usecols]
+        return [header[position] for position in positions], positions, rows
+
+    def _infer(self, names: List[str], positions: List[int], sample: List[List[str]],
+               strings: Iterable[str] = ()) -> List[Type]:
+        """
+        :param strings: names of columns which are known to be string columns
+        :return: types of columns inferred from sample rows
+        """
+        dtypes = []
+        for name, position in zip(names, positions):
+            if name in self.dtypes:
+                dtypes.append(self.dtypes[name])
+                continue
+            if name in strings:
+                dtypes.append(Type.String)
+                continue
+            try:
+                self._parse_floats(CSVReader._values(sample, position))
+                dtypes.append(Type.String if name in self.categorical else Type.Float)
+            except ValueError:
+                dtypes.append(Type.String)
+        return dtypes
+
+    @staticmethod
+    def _values(block: List[List[str]], position: int) -> List[str]:
+        """
+        :return: values of one column in block of rows (missing values are empty)
+        """
+        try:
+            return [row[position] for row in block]
+        except IndexError:
+            return [row[position] if position < len(row) else "" for row in block]
+
+    def _parse_floats(self, values: List[str]) -> List[Union[float, None]]:
+        na_values = self.na_values
+        return [None if value in na_values else float(value) for value in values]
+
+    def _parse_strings(self, values: List[str]) -> List[Union[str, None]]:
+        na_values = self.na_values
+        return [None if value in na_values else value for value in values]
+
     def read(self) -> 'DataFrame':
-        ...
+        strings = set()
+        while True:
+            df = self._read(strings)
+            if df is not None:
+                return df
+
+    def _read(self, strings: set) -> Union['DataFrame', None]:
+        """
+        Reads whole file.
+        :param strings: names of columns which are read as string columns
+        :return: new dataframe or None when text is found in inferred float columns
+                 (their names are added to `strings` and file has to be read again)
+        """
+        with self._open() as f:
+            names, positions, rows = self._rows(f)
+            block = list(islice(rows, max(self.sample_size, 1)))
+            dtypes = self._infer(names, positions, block, strings)
+            buffers = [(array("d"), bytearray()) if dtype == Type.Float else ([], None)
+                       for dtype in dtypes]
+
+            while block:
+                failed = [] # inferred float columns with text in this block
+                for i, position in enumerate(positions):
+                    values = CSVReader._values(block, position)
+                    data, valid = buffers[i]
+                    if valid is None:
+                        data.extend(self._parse_strings(values))
+                        continue
+                    try:
+                        values = self._parse_floats(values)
+                    except ValueError:
+                        if names[i] in self.dtypes:
+                            raise ValueError("Column " + names[i] + " contains value which is not a number")
+                        failed.append(names[i])
+                        continue
+                    data.extend([0.0 if value is None else value for value in values])
+                    valid.extend([value is not None for value in values])
+                if failed:
+                    # raw strings of previous blocks are not kept (eg. "007" would become
+                    # "7.0"), all failed columns of the block are read again at once
+                    strings.update(failed)
+                    return None
+                block = list(islice(rows, self.block_rows))
+
+        columns = {}
+        for name, dtype, (data, valid) in zip(names, dtypes, buffers):
+            column = Column._from_buffers(dtype, data, valid)
+            columns[name] = column.encode() if name in self.categorical else column
+        return DataFrame._from_columns(columns)
+
+    def iter_chunks(self, chunksize: int) -> Iterator[DataFrame]:
+        """
+        Reads dataframe by chunks in constant memory. Types of columns are inferred
+        from sample at the beginning of file and they are the same for all chunks
+        (ValueError is raised when a value in float column is not a number).
+        :param chunksize: maximal number of rows of chunk
+        :return: iterator over dataframes with at most `chunksize` rows
+        """
+        assert chunksize > 0, "Chunk size has to be positive"
+        with self._open() as f:
+            names, positions, rows = self._rows(f)
+            sample = list(islice(rows, max(self.sample_size, 1)))
+            dtypes = self._infer(names, positions, sample)
+            rows = chain(sample, rows)
+            del sample
+
+            while True:
+                block = list(islice(rows, chunksize))
+                if not block:
+                    return
+                columns = {}
+                for name, dtype, position in zip(names, dtypes, positions):
+                    values = CSVReader._values(block, position)
+                    if dtype == Type.Float:
+                        try:
+                            values = self._parse_floats(values)
+                        except ValueError:
+                            raise ValueError("Column " + name + " contains value which is not "
+                                             "a number (set type of column by `dtypes`)")
+                        column = Column._from_buffers(
+                            dtype, array("d", [0.0 if value is None else value for value in values]),
+                            bytearray(value is not None for value in values))
+                    else:
+                        column = Column._from_buffers(dtype, self._parse_strings(values))
+                    columns[name] = column.encode() if name in self.categorical else column
+                yield DataFrame._from_columns(columns)
 
 
 if __name__ == "__main__":
 
-    df = DataFrame.read_json("./test_data.json")
+    df = DataFrame.read_json("./data.json")
     
     print(df)
     
@@ -0,0 +1,357 @@
+import json
+import math
+import os
+import random
+import statistics
+
+import pytest
+
+from .megatherion import Column, CSVReader, DataFrame, JSONReader, Type, trace
+
+
+def test_json_chunks_split_values_at_block_boundary(tmp_path):
+    # numbers like `7.` + `5` or `1e` + `5` are split by blocks of every small size
+    data = {"x": [7.5, 1e5, -0.25, None, 123456.75, 2], "s": ["ab", "cé", None, "7.5", "", "x"]}
+    path = tmp_path / "data.json"
+    path.write_text(json.dumps(data))
+    for block_size in range(1, 24):
+        chunks = list(JSONReader(path, block_size=block_size).iter_chunks(4))
+        assert [list(chunk["x"]) for chunk in chunks] == [data["x"][:4], data["x"][4:]], block_size
+        assert [list(chunk["s"]) for chunk in chunks] == [data["s"][:4], data["s"][4:]], block_size
+
+
+def test_binary_rewrite_of_mapped_file(tmp_path):
+    path = tmp_path / "data.bin"
+    DataFrame({"f": Column([1.5, None, 3], Type.Float),
+               "s": Column(["a", None, "b"], Type.String)}).to_binary(path)
+    df = DataFrame.read_binary(path, mmap=True)
+    df.setvalue("f", 0, 2.5)
+    df.to_binary(path)
+    again = DataFrame.read_binary(path)
+    assert list(again["f"]) == [2.5, None, 3.0]
+    assert list(again["s"]) == ["a", None, "b"]
+    assert not again["s"].categorical
+    assert [item.name for item in tmp_path.iterdir()] == ["data.bin"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_binary_file_mode(tmp_path):
+    path = tmp_path / "data.bin"
+    df = DataFrame({"f": Column([1.5, None, 3], Type.Float)})
+    umask = os.umask(0o022)
+    try:
+        df.to_binary(path)
+    finally:
+        os.umask(umask)
+    assert path.stat().st_mode & 0o777 == 0o644
+    path.chmod(0o640)
+    df.to_binary(path)
+    assert path.stat().st_mode & 0o777 == 0o640
+
+
+def test_binary_keeps_categorical_flag(tmp_path):
+    path = tmp_path / "data.bin"
+    DataFrame({"plain": Column(["a", None, "b", "a"], Type.String),
+               "codes": Column(["x", "y", None, "x"], Type.String, categorical=True)}).to_binary(path)
+    for mapped in (True, False):
+        df = DataFrame.read_binary(path, mmap=mapped)
+        assert not df["plain"].categorical
+        assert list(df["plain"]) == ["a", None, "b", "a"]
+        assert df["codes"].categorical
+        assert list(df["codes"]) == ["x", "y", None, "x"]
+
+
+def test_categorical_items():
+    column = Column(["a", None, "b", "a"], Type.String, categorical=True)
+    assert [column[i] for i in range(-4, 4)] == ["a", None, "b", "a"] * 2
+    assert column[1:] == [None, "b", "a"]
+
+
+def test_csv_text_in_inferred_float_column(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("zip,year\n00000,1961\n01234,1962\nA-1,1963\n")
+    df = DataFrame.read_csv(path, sample_size=1, block_rows=1)
+    assert df["zip"].dtype == Type.String
+    assert list(df["zip"]) == ["00000", "01234", "A-1"]
+    assert list(df["year"]) == [1961.0, 1962.0, 1963.0]
+
+    path.write_text("year\n1961\nunknown\n")
+    with pytest.raises(ValueError):
+        DataFrame.read_csv(path, sample_size=1, block_rows=1, dtypes={"year": Type.Float})
+
+
+def test_index_survives_failed_setvalue():
+    df = DataFrame({"f": Column([1.0, 2.0], Type.Float)})
+    index = df.create_index("f")
+    with pytest.raises(ValueError):
+        df.setvalue("f", 0, "bad")
+    assert index[1.0] == [0]
+    df.setvalue("f", 0, 2)
+    assert index[2.0] == [0, 1] and index[1.0] == []
+
+
+def test_failed_append_rows_keeps_columns_aligned():
+    df = DataFrame({"s": Column(["a"], Type.String, categorical=True), "f": Column([1.0], Type.Float)})
+    with pytest.raises(ValueError):
+        df.append_rows([("b", 2.0), ("c", "oops")])
+    assert len(df) == 1 and len(df["s"]) == 1 and len(df["f"]) == 1
+    assert df["s"].categories == ["a"]
+    df.append_rows([("b", 2), (None, None)])
+    assert list(df) == [("a", 1.0), ("b", 2.0), (None, None)]
+
+
+def test_join_prefix_does_not_replace_columns():
+    left = DataFrame({"k": Column([1, 2], Type.Float), "v": Column(["p", "q"], Type.String),
+                      "_otherv": Column(["x", "y"], Type.String)})
+    right = DataFrame({"k": Column([2, 1], Type.Float), "v": Column(["b", "a"], Type.String)})
+    joined = left.inner_join(right, "k", "k")
+    assert list(joined.columns) == ["k", "v", "_otherv", "_otherk", "_other_otherv"]
+    assert list(joined["_otherv"]) == ["x", "y"] and list(joined["_other_otherv"]) == ["a", "b"]
+
+
+def test_column_of_dataframe_is_copy():
+    df = DataFrame({"a": Column([1.0, 2.0], Type.Float)})
+    column = df["a"]
+    column.append(3.0)
+    column[0] = 5.0
+    assert len(df) == 2 and list(df["a"]) == [1.0, 2.0]
+    assert len(df.filter(df["a"] > 1)) == 1
+
+
+def test_sort_accepts_col_name_keyword():
+    df = DataFrame({"a": Column([2.0, 1.0, None], Type.Float)})
+    assert list(df.sort(col_name="a")["a"]) == list(df.sort("a")["a"]) == [1.0, 2.0, None]
+    assert list(df.lazy().sort(col_name="a", ascending=False).collect()["a"]) == [2.0, 1.0, None]
+    with pytest.raises(TypeError):
+        df.sort("a", col_name="a")
+
+
+def test_read_many_does_not_drop_files(tmp_path):
+    (tmp_path / "a.csv").write_text("x,y\n1,a\n2,b\n")
+    (tmp_path / "b.csv").write_text("x,y\n3,c\n")
+    (tmp_path / "e.csv").write_text("")
+    paths = [tmp_path / "a.csv", tmp_path / "b.csv", tmp_path / "a.csv"]
+    assert list(DataFrame.read_many(paths, workers=1)["x"]) == [1.0, 2.0, 3.0, 1.0, 2.0]
+    with pytest.raises(ValueError, match="no header line"):
+        DataFrame.read_many([tmp_path / "a.csv", tmp_path / "e.csv", tmp_path / "a.csv"], workers=1)
+
+
+def test_csv_without_header_line(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("")
+    with pytest.raises(ValueError, match="no header line"):
+        DataFrame.read_csv(path)
+    with pytest.raises(ValueError, match="no header line"):
+        list(DataFrame.iter_chunks(path, 10))
+
+
+def test_csv_text_in_more_float_columns_is_read_again_once(tmp_path, monkeypatch):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b,c\n1,2,3\n4,5,6\nx,y,7\n")
+    reads = []
+    monkeypatch.setattr(CSVReader, "_open", lambda self: reads.append(1) or open(self.path, newline=""))
+    df = DataFrame.read_csv(path, sample_size=1, block_rows=10)
+    assert len(reads) == 2
+    assert [df[name].dtype for name in "abc"] == [Type.String, Type.String, Type.Float]
+    assert list(df["a"]) == ["1", "4", "x"]
+
+
+def test_rolling_std_against_brute_force():
+    rng = random.Random(7)
+    for offset in (0.0, 1e9):
+        values = [None if rng.random() < 0.1 else offset + rng.choice([0.1, 0.2, 0.3, 0.4, 20.0])
+                  for _ in range(300)]
+        values[50:60] = [offset + 12.5] * 10
+        result = list(Column(values, Type.Float).rolling(4, "std"))
+        for i, item in enumerate(result):
+            window = [value for value in values[max(i - 3, 0):i + 1] if value is not None]
+            if i < 3 or len(window) < 2:
+                assert item is None
+            else:
+                assert item == pytest.approx(statistics.stdev(window), abs=1e-6), (offset, i)
+    window = Column([1e9 + 0.1, 1e9 + 0.2, 1e9 + 0.3, 1e9 + 0.4], Type.Float).rolling(4, "std")
+    assert window[3] == pytest.approx(0.129099, abs=1e-6)
+
+
+def test_rolling_and_cumulative_against_brute_force():
+    rng = random.Random(11)
+    values = [None if rng.random() < 0.2 else float(rng.randint(-50, 50)) for _ in range(200)]
+    column = Column(values, Type.Float)
+    functions = {"mean": statistics.fmean, "sum": sum, "min": min, "max": max}
+    for window in (1, 3, 8):
+        for op, function in functions.items():
+            for skipna in (True, False):
+                result = list(column.rolling(window, op, skipna))
+                for i, item in enumerate(result):
+                    items = values[max(i - window + 1, 0):i + 1]
+                    present = [value for value in items if value is not None]
+                    if i < window - 1 or not present or (not skipna and None in items):
+                        assert item is None
+                    else:
+                        assert item == pytest.approx(function(present)), (window, op, i)
+
+    functions = {"min": min, "max": max, "sum": sum, "prod": math.prod}
+    for op, function in functions.items():
+        result = list(column.cumulative(op))
+        for i, item in enumerate(result):
+            present = [value for value in values[:i + 1] if value is not None]
+            assert item == (pytest.approx(function(present)) if present else None), (op, i)
+        result = list(column.cumulative(op, skipna=False))
+        first_none = values.index(None)
+        assert result[first_none:] == [None] * (len(values) - first_none)
+        assert result[:first_none] == [pytest.approx(function(values[:i + 1]))
+                                       for i in range(first_none)]
+
+
+def test_copies_of_shared_columns_are_traced():
+    df = DataFrame({"f": Column([1.0, 2.0, 3.0], Type.Float),
+                    "s": Column(["a", "b", "c"], Type.String)})
+    with trace() as tracer:
+        copy = df.select("f", "s")
+        copy.setvalue("f", 0, 5.0)
+        copy.append_row((4.0, "d"))
+        del copy[0]
+        copy.append_column("g", df["f"])
+    records = [(record["operation"], record["columns_copied"]) for record in tracer.records]
+    assert records[1:] == [("DataFrame.setvalue", 1), ("DataFrame.append_row", 1),
+                           ("DataFrame.__delitem__", 0), ("DataFrame.append_column", 0)]
+    assert list(df["f"]) == [1.0, 2.0, 3.0]
+
+
+def test_lazy_filter_pushdown():
+    df = DataFrame({"a": Column([3, 1, None, 2, 5], Type.Float),
+                    "b": Column(["x", "y", "z", "x", "y"], Type.String)})
+    is_x = lambda value: value == "x"
+
+    query = df.lazy().sort("a").filter("b", is_x)
+    assert query.explain() == "scan -> filter(b) -> sort(a)"
+    assert list(query.collect()) == list(df.sort("a").filter("b", is_x))
+
+    query = df.lazy().extend(df.lazy()).filter("b", is_x)
+    assert query.explain() == "scan -> filter(b) -> extend([scan -> filter(b)])"
+    assert list(query.collect()) == list(df.extend(df).filter("b", is_x))
+
+    # filters are not moved before head and unique (the result would change)
+    query = df.lazy().head(2).filter("b", is_x)
+    assert query.explain() == "scan -> head(2) -> filter(b)"
+    assert list(query.collect()) == [(3.0, "x")]
+
+    query = df.lazy().unique("b").filter("a", lambda value: value is not None and value > 1)
+    assert query.explain() == "scan -> unique(b) -> filter(a)"
+    assert list(query.collect()) == [(3.0, "x")]
+
+
+def test_joins_against_nested_loops():
+    left = DataFrame({"k": Column([1, 1, 2, None, 4], Type.Float),
+                      "l": Column(["a", "b", "c", "d", "e"], Type.String)})
+    right = DataFrame({"k": Column([None, 1, 2, 2, 3], Type.Float),
+                       "r": Column(["v", "w", "x", "y", "z"], Type.String)})
+    inner = [a + b for a in left for b in right if a[0] is not None and a[0] == b[0]]
+    left_only = [a + (None, None) for a in left if all(a[0] is None or a[0] != b[0] for b in right)]
+    right_only = [(None, None) + b for b in right if all(b[0] is None or a[0] != b[0] for a in left)]
+    expected = {"inner": inner, "left": inner + left_only, "outer": inner + left_only + right_only}
+    for method in ("hash", "merge"):
+        for how, join in (("inner", left.inner_join), ("left", left.left_join),
+                          ("outer", left.outer_join)):
+            result = join(right, "k", "k", method=method)
+            assert list(result.columns) == ["k", "l", "_otherk", "r"]
+            assert sorted(result, key=repr) == sorted(expected[how], key=repr), (method, how)
+
+
+def test_merge_join_requires_sorted_keys():
+    left = DataFrame({"k": Column([2, 1], Type.Float)})
+    with pytest.raises(ValueError):
+        left.inner_join(left, "k", "k", method="merge")
+
+
+def test_groupby_aggregates_are_aligned_with_keys():
+    rng = random.Random(3)
+    size = 200
+    years = [rng.choice([1961.0, 1962.0, None]) for _ in range(size)]
+    months = [rng.choice(["b", "a", "c"]) for _ in range(size)]
+    values = [None if rng.random() < 0.2 else float(rng.randint(-10, 10)) for _ in range(size)]
+    df = DataFrame({"rok": Column(years, Type.Float),
+                    "mesic": Column(months, Type.String, categorical=True),
+                    "X1.": Column(values, Type.Float)})
+    for keys in (["mesic"], ["rok"], ["rok", "mesic"]):
+        groups = {}
+        for row in df:
+            key = tuple(row[list(df.columns).index(name)] for name in keys)
+            if None not in key:
+                groups.setdefault(key, []).append(row[2])
+        result = df.groupby(keys).agg({"X1.": ["count", "sum", "min", "max", "mean"]})
+        assert [tuple(row[:len(keys)]) for row in result] == list(groups) # order of first occurence
+        for row in result:
+            present = [value for value in groups[tuple(row[:len(keys)])] if value is not None]
+            assert row[len(keys):] == (len(present), sum(present), min(present), max(present),
+                                       pytest.approx(statistics.fmean(present)))
+
+
+def test_multi_key_sort_against_stable_sorts():
+    rng = random.Random(5)
+    size = 100
+    df = DataFrame({"rok": Column([rng.choice([1.0, 2.0, 3.0, None]) for _ in range(size)], Type.Float),
+                    "zanr": Column([rng.choice(["b", "a", None]) for _ in range(size)], Type.String,
+                                   categorical=True),
+                    "row": Column(range(size), Type.Float)})
+    for ascending in (True, False, [True, False], [False, True]):
+        directions = [ascending] * 2 if isinstance(ascending, bool) else ascending
+        for na_position in ("first", "last"):
+            expected = list(df)
+            for position, direction in reversed(list(enumerate(directions))):
+                missing = [row for row in expected if row[position] is None]
+                present = sorted((row for row in expected if row[position] is not None),
+                                 key=lambda row: row[position], reverse=not direction)
+                expected = missing + present if na_position == "first" else present + missing
+            result = df.sort(["rok", "zanr"], ascending, na_position)
+            assert list(result) == expected, (ascending, na_position)
+            assert list(df.lazy().sort(["rok", "zanr"], ascending, na_position).collect()) == expected
+
+
+def test_weighted_sample_without_replacement():
+    df = DataFrame({"row": Column(range(6), Type.Float),
+                    "w": Column([1, 2, 3, 4, 0, None], Type.Float)})
+    rng = random.Random(1)
+    counts = [0] * 6
+    for _ in range(4000):
+        rows = [int(row) for row, _ in df.sample(3, norepeat=True, weights="w", random_state=rng)]
+        assert len(set(rows)) == 3 and set(rows) <= {0, 1, 2, 3}
+        first = df.sample(1, norepeat=True, weights="w", random_state=rng)["row"][0]
+        counts[int(first)] += 1
+    assert [count / 4000 for count in counts] == pytest.approx([0.1, 0.2, 0.3, 0.4, 0, 0], abs=0.03)
+
+    assert list(df.sample(4, norepeat=True, weights="w", random_state=7)) == \
+        list(df.sample(4, norepeat=True, weights="w", random_state=7))
+    with pytest.raises(AssertionError):
+        df.sample(5, norepeat=True, weights="w")
+
+
+def test_indexes_are_maintained_by_mutations():
+    rng = random.Random(9)
+    df = DataFrame({"rok": Column([rng.choice([1961, 1962, 1963, None]) for _ in range(30)], Type.Float),
+                    "autor": Column([rng.choice(["A", "B", None]) for _ in range(30)], Type.String)})
+    indexes = [df.create_index("rok"), df.create_index("autor", "sorted"),
+               df.create_index(["rok", "autor"], "sorted")]
+    for step in range(200):
+        operation = rng.choice(["delete", "setvalue", "append_row", "append_rows"])
+        if operation == "delete" and len(df) > 0:
+            del df[rng.randrange(-len(df), len(df))]
+        elif operation == "setvalue" and len(df) > 0:
+            df.setvalue("rok", rng.randrange(len(df)), rng.choice([1961, 1964, None]))
+            df.setvalue("autor", rng.randrange(len(df)), rng.choice(["A", "C", None]))
+        elif operation == "append_row":
+            df.append_row((rng.choice([1961, 1962, None]), rng.choice(["B", "C", None])))
+        else:
+            df.append_rows([(1963, "A"), (None, "B")])
+
+        for index in indexes:
+            positions = [list(df.columns).index(name) for name in index.names]
+            expected = {}
+            for row, values in enumerate(df):
+                key = values[positions[0]] if len(positions) == 1 else tuple(values[p] for p in positions)
+                if key is not None and not (isinstance(key, tuple) and None in key):
+                    expected.setdefault(key, []).append(row)
+            assert len(index) == sum(map(len, expected.values())), (step, index)
+            for key, rows in expected.items():
+                assert index[key] == rows, (step, index, key)
+    assert indexes[1]["A":"B"] == sorted(row for row, values in enumerate(df) if values[1] in ("A", "B"))